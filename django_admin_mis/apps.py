@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 
 
 class DjangoAdminMisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_admin_mis'
+
+    def ready(self):
+        from .cache import get_cache
+        from .invalidation import get_dependency_graph
+
+        # Bump the cache versions of the admin models affected by a write,
+        # the admin registry is filled by django.contrib.admin's ready()
+        if get_cache() is not None:
+            get_dependency_graph()
+
+        # Precompute the schemas and caches of each serving process on its first request
+        if getattr(settings, 'ADMIN_MIS_WARMUP', False):
+            from .warmup import warm_up_worker
+            request_started.connect(warm_up_worker, dispatch_uid='admin_mis_warmup')
@@ -0,0 +1,284 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import NotAcceptable, ParseError
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from .changelist import afetch
+from .events import format_sse, format_sse_reset, get_broker
+from .utils import is_asgi_request
+from .views import AdminModelViewSet
+
+
+class AsyncAdminModelView(View):
+    """
+    Base class of the native async variants of the AdminModelViewSet read actions.
+
+    Authentication, permission and throttle checks run through the viewset's
+    own `initial`, so both variants enforce the same rules. Object reads go
+    through Django's async ORM, the admin machinery (ChangeList construction
+    and results, serialization) runs in a single sync hop per phase.
+    """
+    viewset_class = AdminModelViewSet
+    action = None
+
+    def get_viewset(self, request, *args, **kwargs):
+        viewset = self.viewset_class(
+            action_map={'get': self.action},
+            args=args,
+            kwargs=kwargs,
+            format_kwarg=None,
+        )
+        # The browsable API renders forms with sync ORM calls
+        viewset.renderer_classes = [
+            renderer for renderer in viewset.renderer_classes
+            if not issubclass(renderer, BrowsableAPIRenderer)
+        ]
+        viewset.headers = viewset.default_response_headers
+        return viewset
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if handler is None:
+            return HttpResponseNotAllowed(self._allowed_methods())
+
+        viewset = self.get_viewset(request, *args, **kwargs)
+        request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.request = request
+
+        try:
+            try:
+                data = await handler(viewset, request, *args, **kwargs)
+                response = Response(data, status=status.HTTP_200_OK)
+            except Exception as exc:
+                response = viewset.handle_exception(exc)
+
+            response = viewset.finalize_response(request, response, *args, **kwargs)
+            return response.render()
+        finally:
+            # Uncaught exceptions skip finalize_response
+            viewset.release_concurrency_slot()
+
+    def initial(self, viewset, request, *args, **kwargs):
+        # Authenticate, check permissions and throttles, then resolve the model
+        viewset.initial(request, *args, **kwargs)
+        return viewset.get_model_register_admin()
+
+
+class AsyncListDisplayView(AsyncAdminModelView):
+    action = 'list_display_data'
+
+    def prepare(self, viewset, request, *args, **kwargs):
+        _, register_app = self.initial(viewset, request, *args, **kwargs)
+
+        ch_inst, filter_list = viewset.prepare_changelist(request, register_app)
+        # The admin's own get_results, paginator and full result count; async
+        # ORM queries would run on the same thread-sensitive executor anyway
+        viewset.load_changelist(request, ch_inst)
+        return register_app, ch_inst, filter_list
+
+    async def get(self, viewset, request, *args, **kwargs):
+        register_app, ch_inst, filter_list = await sync_to_async(self.prepare)(
+            viewset, request, *args, **kwargs
+        )
+
+        return await sync_to_async(viewset.get_changelist_data)(
+            request, register_app, ch_inst, filter_list
+        )
+
+
+class AsyncRetrieveView(AsyncAdminModelView):
+    action = 'retrieve_data'
+
+    def prepare(self, viewset, request, *args, **kwargs):
+        model, register_app = self.initial(viewset, request, *args, **kwargs)
+        pk = viewset.get_object_pk()
+
+        queryset = viewset.get_retrieve_queryset(request, model, register_app)
+        if queryset is None:
+            queryset = register_app.get_queryset(request)
+
+        return model, register_app, queryset, pk
+
+    def get_inline_querysets(self, viewset, request, register_app, instance):
+        # Check object-level permissions (may raise a permission denied exception)
+        viewset.check_object_permissions(request, instance)
+
+        inline_instances = register_app.get_inline_instances(request, instance)
+        querysets = [
+            viewset.get_inline_queryset(request, inline_instance, instance)
+            for inline_instance in inline_instances
+        ]
+        return inline_instances, querysets
+
+    async def get(self, viewset, request, *args, **kwargs):
+        model, register_app, queryset, pk = await sync_to_async(self.prepare)(
+            viewset, request, *args, **kwargs
+        )
+
+        try:
+            instance = await queryset.aget(pk=pk)
+        except model.DoesNotExist:
+            raise ParseError({
+                "detail": "Not found."
+            })
+
+        inline_instances, querysets = await sync_to_async(self.get_inline_querysets)(
+            viewset, request, register_app, instance
+        )
+
+        # The parent is serialized while the inline objects are fetched
+        ser, *inline_objects = await asyncio.gather(
+            sync_to_async(viewset.get_retrieve_data)(request, model, register_app, instance),
+            *[afetch(queryset) for queryset in querysets]
+        )
+
+        if inline_instances:
+            await sync_to_async(viewset.get_inline_object_data)(
+                request, ser, inline_instances, instance, inline_objects
+            )
+
+        return ser
+
+
+class AsyncFieldMetaView(AsyncAdminModelView):
+    action = 'list_field_meta'
+
+    def get_data(self, viewset, request, *args, **kwargs):
+        model, register_app = self.initial(viewset, request, *args, **kwargs)
+        return viewset.get_cached_model_fields_data(request, model, register_app)
+
+    async def get(self, viewset, request, *args, **kwargs):
+        # Field metadata is built from admin and form classes only, one hop is enough
+        return await sync_to_async(self.get_data)(viewset, request, *args, **kwargs)
+
+
+class EventStreamNegotiation(BaseContentNegotiation):
+    """
+    Render the errors of event stream requests with the first renderer (JSON).
+    """
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class ModelEventsView(AsyncAdminModelView):
+    """
+    Push channel of the changes made to a model through the admin API.
+
+    Clients accepting text/event-stream get a server-sent events stream, with
+    replay of missed events from the Last-Event-ID header. Other clients
+    long-poll: the request returns as soon as events are published, or with
+    an empty list after 'timeout' seconds. When the missed events are not
+    known (the id comes from another process), streams send a 'reset' event
+    and long-polls answer 'reset': true.
+
+    Requires an ASGI server: under WSGI a stream would hold a worker and be
+    buffered, so it is refused with 406; long-polls hold a worker thread.
+    """
+    action = 'list_changes_data'
+    heartbeat = 15
+    max_long_poll = 60
+    # Coalesce events published within this delay into one long-poll answer
+    batch_delay = 0.05
+
+    async def dispatch(self, request, *args, **kwargs):
+        if 'text/event-stream' not in request.headers.get('Accept', ''):
+            return await super().dispatch(request, *args, **kwargs)
+
+        viewset = self.get_viewset(request, *args, **kwargs)
+        viewset.content_negotiation_class = EventStreamNegotiation
+        request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.request = request
+
+        try:
+            model, _ = await sync_to_async(self.initial)(viewset, request, *args, **kwargs)
+            if not is_asgi_request(request):
+                raise NotAcceptable('Event streams require an ASGI server, long-poll instead.')
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+            response = viewset.finalize_response(request, response, *args, **kwargs)
+            return response.render()
+
+        last_id = request.headers.get('Last-Event-ID')
+
+        response = StreamingHttpResponse(
+            self.stream(model, last_id), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def initial(self, viewset, request, *args, **kwargs):
+        resolved = super().initial(viewset, request, *args, **kwargs)
+        # Waiting for events does not hold one of the user's request slots
+        viewset.release_concurrency_slot()
+        return resolved
+
+    async def stream(self, model, last_id):
+        opts = model._meta
+        broker = get_broker()
+        subscription = broker.subscribe(opts.app_label, opts.model_name)
+
+        # Streams are closed after a while, EventSource reconnects with Last-Event-ID
+        deadline = time.monotonic() + getattr(settings, 'ADMIN_MIS_EVENTS_STREAM_TIMEOUT', 300)
+        try:
+            yield 'retry: 1000\n\n'
+            if last_id:
+                events = broker.replay(opts.app_label, opts.model_name, last_id)
+                if events is None:
+                    yield format_sse_reset()
+                for event in events or ():
+                    yield format_sse(event)
+
+            while time.monotonic() < deadline:
+                try:
+                    event = await subscription.get(self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield format_sse(event)
+        finally:
+            subscription.close()
+
+    async def get(self, viewset, request, *args, **kwargs):
+        model, _ = await sync_to_async(self.initial)(viewset, request, *args, **kwargs)
+        opts = model._meta
+
+        try:
+            timeout = min(float(request.query_params.get('timeout', 25)), self.max_long_poll)
+        except ValueError:
+            raise ParseError({'message': 'Timeout must be a number.'})
+        last_id = request.query_params.get('last_id')
+
+        broker = get_broker()
+        subscription = broker.subscribe(opts.app_label, opts.model_name)
+        try:
+            events = broker.replay(opts.app_label, opts.model_name, last_id) if last_id else []
+            if events is None:
+                return {'events': [], 'last_id': None, 'reset': True}
+
+            if not events:
+                try:
+                    events.append(await subscription.get(max(timeout, 0)))
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    await asyncio.sleep(self.batch_delay)
+                    events.extend(subscription.get_pending())
+        finally:
+            subscription.close()
+
+        return {
+            'events': events,
+            'last_id': events[-1]['id'] if events else last_id,
+        }
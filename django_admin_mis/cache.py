@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'admin_mis'
+
+# Seconds a computing worker holds the lock of a key
+LOCK_TIMEOUT = 30
+# Seconds the other workers wait for its result before computing it themselves
+LOCK_WAIT = 5
+
+# Seconds each kind of result is kept, overridden with ADMIN_MIS_CACHE_TIMEOUTS
+DEFAULT_TIMEOUTS = {
+    'menu': 300,
+    'fields': 300,
+    'filters': 60,
+    'count': 30,
+}
+
+_missing = object()
+
+# Stored in place of results which cannot be pickled, so they are computed without the lock
+UNCACHEABLE = f'{KEY_PREFIX}:uncacheable'
+
+def get_cache():
+    """
+    Return the cache named by ADMIN_MIS_CACHE, or None when caching is off.
+    """
+    alias = getattr(settings, 'ADMIN_MIS_CACHE', None)
+    if not alias:
+        return None
+    return caches[alias]
+
+def get_timeout(kind):
+    timeouts = getattr(settings, 'ADMIN_MIS_CACHE_TIMEOUTS', {})
+    return timeouts.get(kind, DEFAULT_TIMEOUTS[kind])
+
+def jitter(timeout, spread=0.1):
+    """
+    Spread expirations by +/- ``spread`` so keys set together do not expire together.
+    """
+    return max(int(timeout * random.uniform(1 - spread, 1 + spread)), 1)
+
+def make_key(kind, *parts):
+    # Hashed so user input and long SQL make valid memcached keys
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{kind}:{digest}'
+
+def get_user_key(request):
+    user = getattr(request, 'user', None)
+    return getattr(user, 'pk', None)
+
+def get_or_compute(kind, key_parts, compute, wait=True):
+    """
+    Return the cached result of ``compute()``, computing it in a single worker.
+
+    The first worker to miss takes a lock with ``cache.add`` and computes the
+    value; the others poll the cache for up to LOCK_WAIT seconds before
+    computing it themselves. With ``wait=False`` (requests served through
+    ASGI, whose threads should not sleep), they compute it at once instead.
+    Without a cache, ``compute()`` is called directly.
+    """
+    cache = get_cache()
+    if cache is None:
+        return compute()
+
+    key = make_key(kind, *key_parts)
+    value = cache.get(key, _missing)
+    if value == UNCACHEABLE:
+        return compute()
+    if value is not _missing:
+        record_cache(kind, True)
+        return value
+
+    record_cache(kind, False)
+    lock_key = f'{key}:lock'
+    # Identifies this worker's lock, which may expire and be taken by another one
+    token = uuid.uuid4().hex
+
+    if not cache.add(lock_key, token, LOCK_TIMEOUT):
+        if not wait:
+            return compute()
+
+        deadline = time.monotonic() + LOCK_WAIT
+        delay = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+            value = cache.get(key, _missing)
+            if value is not _missing:
+                return compute() if value == UNCACHEABLE else value
+
+        # The lock holder is slow or gone, compute without waiting further
+        return compute()
+
+    try:
+        value = compute()
+        try:
+            cache.set(key, value, jitter(get_timeout(kind)))
+        except Exception as e:
+            # Unpicklable values (e.g. lambdas in list_display) are computed on each request
+            logger.warning('Unable to cache %s result: %s', kind, e)
+            cache.set(key, UNCACHEABLE, jitter(get_timeout(kind)))
+        return value
+    finally:
+        # Only the lock still holding this worker's token; the cache offers no
+        # atomic compare-and-delete, the window left is a single round-trip
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+def get_queryset_key(queryset):
+    """
+    Return a key identifying the SQL of a queryset, or None when it cannot be compiled.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except Exception:
+        return None
+    return queryset.db, sql, tuple(str(param) for param in params)
+
+def get_cached_count(queryset, wait=True):
+    """
+    COUNT of ``queryset``, shared between workers until the 'count' timeout
+    or a write to the model or its related models.
+    """
+    from .invalidation import get_versions
+
+    key = get_queryset_key(queryset)
+    if key is None:
+        return queryset.count()
+    return get_or_compute(
+        'count', key + get_versions([queryset.model]), queryset.count, wait=wait
+    )
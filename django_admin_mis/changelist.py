@@ -0,0 +1,170 @@
+from operator import attrgetter
+
+from django.contrib.admin import ModelAdmin
+
+from .metrics import record_cache
+
+
+class CountedModelAdmin:
+    """
+    Proxy of a ModelAdmin handing an already known count to the ChangeList paginator.
+    """
+    # The unfiltered count is set by the caller
+    show_full_result_count = False
+
+    def __init__(self, model_admin, count):
+        self._model_admin = model_admin
+        self._count = count
+
+    def __getattr__(self, name):
+        return getattr(self._model_admin, name)
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = self._model_admin.get_paginator(*args, **kwargs)
+        # Paginator.count is a cached_property
+        paginator.__dict__['count'] = self._count
+        return paginator
+
+
+class DeferredResultsMixin:
+    """
+    ChangeList mixin that skips loading the results while the ChangeList is built.
+
+    The filtered, searched and ordered queryset is available as ``queryset``;
+    callers load the page explicitly with ``load_results`` once they are done
+    adjusting it, or fetch the rows themselves.
+    """
+    results_loaded = False
+
+    def get_results(self, request):
+        # Called from ChangeList.__init__, results are loaded on demand
+        pass
+
+    def load_results(self, request, get_count=None):
+        """
+        Load the page. ``get_count(queryset)``, when given, replaces the COUNT
+        queries of the filtered and unfiltered querysets (e.g. with cached counts).
+        """
+        if get_count is None:
+            super().get_results(request)
+            self.results_loaded = True
+            return
+
+        model_admin = self.model_admin
+        full_result_count = None
+        if model_admin.show_full_result_count:
+            full_result_count = get_count(self.root_queryset)
+
+        self.model_admin = CountedModelAdmin(model_admin, get_count(self.queryset))
+        try:
+            super().get_results(request)
+        finally:
+            self.model_admin = model_admin
+
+        self.show_full_result_count = model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(full_result_count)
+        self.full_result_count = full_result_count
+        self.results_loaded = True
+
+
+# Deferred ChangeList classes, one per ChangeList class
+_deferred_changelist_classes = {}
+
+def get_deferred_changelist_class(changelist_class):
+    deferred_class = _deferred_changelist_classes.get(changelist_class)
+    record_cache('changelist_class', deferred_class is not None)
+
+    if deferred_class is None:
+        deferred_class = type(
+            f'Deferred{changelist_class.__name__}',
+            (DeferredResultsMixin, changelist_class),
+            {}
+        )
+        _deferred_changelist_classes[changelist_class] = deferred_class
+
+    return deferred_class
+
+def get_changelist_instance(register_app, request, defer_results=False):
+    """
+    Return a ChangeList for ``register_app``, optionally without loading its results.
+
+    Mirrors ModelAdmin.get_changelist_instance. Admins overriding that method
+    get their own ChangeList, with its results already loaded.
+    """
+    overridden = type(register_app).get_changelist_instance is not ModelAdmin.get_changelist_instance
+    if not defer_results or overridden:
+        return register_app.get_changelist_instance(request)
+
+    list_display = register_app.get_list_display(request)
+    list_display_links = register_app.get_list_display_links(request, list_display)
+    # Add the action checkboxes if any actions are available.
+    if register_app.get_actions(request):
+        list_display = ['action_checkbox', *list_display]
+    sortable_by = register_app.get_sortable_by(request)
+    ChangeList = get_deferred_changelist_class(register_app.get_changelist(request))
+
+    return ChangeList(
+        request,
+        register_app.model,
+        list_display,
+        list_display_links,
+        register_app.get_list_filter(request),
+        register_app.date_hierarchy,
+        register_app.get_search_fields(request),
+        register_app.get_list_select_related(request),
+        register_app.list_per_page,
+        register_app.list_max_show_all,
+        register_app.list_editable,
+        register_app,
+        sortable_by,
+        register_app.search_help_text,
+    )
+
+def _model_column(name):
+    def get_value(obj):
+        value = getattr(obj, name)
+        if callable(value):
+            return value()
+        return str(value) if hasattr(value, 'pk') else value
+    return get_value
+
+def get_column_plan(register_app, list_display):
+    """
+    Compile list_display into a list of (column name, getter) pairs.
+
+    Columns named after an admin method call it with the object, the others
+    read the model attribute (calling it when callable). Related objects are
+    rendered with str(). An 'id' column is prepended when list_display lacks one.
+    """
+    plan = []
+    if 'id' not in list_display:
+        plan.append(('id', attrgetter('id')))
+
+    for column in list_display:
+        if callable(column):
+            plan.append((column.__name__, column))
+
+        elif hasattr(register_app, column) and column != '__str__':
+            plan.append((column, getattr(register_app, column)))
+
+        else:
+            plan.append((column, _model_column(column)))
+
+    return plan
+
+def load_changelist_results(ch_inst, request, get_count=None):
+    """
+    Load the results of a deferred ChangeList, if they are not loaded yet.
+    """
+    if not getattr(ch_inst, 'results_loaded', True):
+        ch_inst.load_results(request, get_count)
+    return ch_inst
+
+async def afetch(queryset):
+    """
+    Evaluate a queryset with the async ORM.
+    """
+    if queryset._prefetch_related_lookups:
+        # aiterator() does not support prefetch_related()
+        return [obj async for obj in queryset]
+    return [obj async for obj in queryset.aiterator()]
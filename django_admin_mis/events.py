@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Events kept per model for clients reconnecting with Last-Event-ID
+REPLAY_SIZE = 1000
+# Events queued per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class Subscription:
+    def __init__(self, broker, key, loop):
+        self.broker = broker
+        self.key = key
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def put(self, event):
+        # Runs in the subscriber's event loop
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def get_pending(self):
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Publish/subscribe of model change events within the current process.
+
+    Publishers may run in any thread, events are handed to each subscriber's
+    event loop. Deployments running several processes need a broker shared
+    between them, set with ADMIN_MIS_EVENTS_BROKER.
+
+    Event ids read '<epoch>-<number>', the epoch being drawn when the broker
+    is created: an id sent by another process, or before a restart, is not
+    mistaken for one of this broker's.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+        # (number, event) pairs per model, and the number of the last one dropped
+        self.recent = {}
+        self.dropped = {}
+        self.epoch = uuid.uuid4().hex[:8]
+        self.ids = itertools.count(1)
+
+    def subscribe(self, app_label, model_name):
+        key = (app_label, model_name)
+        subscription = Subscription(self, key, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions.setdefault(key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.key)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.key]
+
+    def publish(self, app_label, model_name, event):
+        key = (app_label, model_name)
+        with self.lock:
+            number = next(self.ids)
+            event = dict(event, id=f'{self.epoch}-{number}')
+            recent = self.recent.setdefault(key, deque(maxlen=REPLAY_SIZE))
+            if len(recent) == recent.maxlen:
+                self.dropped[key] = recent[0][0]
+            recent.append((number, event))
+            subscriptions = list(self.subscriptions.get(key, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+        return event
+
+    def replay(self, app_label, model_name, last_id):
+        """
+        Return the kept events published after ``last_id``, or None when they
+        are not known: the id was not issued by this broker, or events after
+        it were dropped. Clients then reload their data (a 'reset' event).
+        """
+        epoch, _, number = str(last_id).rpartition('-')
+        if epoch != self.epoch or not number.isdigit():
+            return None
+
+        key = (app_label, model_name)
+        with self.lock:
+            recent = list(self.recent.get(key, ()))
+            dropped = self.dropped.get(key, 0)
+
+        if int(number) < dropped:
+            return None
+        return [event for event_number, event in recent if event_number > int(number)]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = getattr(settings, 'ADMIN_MIS_EVENTS_BROKER', None)
+                _broker = import_string(broker_class)() if broker_class else InProcessBroker()
+    return _broker
+
+def publish_change(model, action, pks, **extra):
+    """
+    Publish a change of ``model`` objects once the current transaction commits.
+
+    ``action`` is 'added', 'changed', 'deleted' or 'action' (an admin action
+    ran on the objects, named by the ``name`` extra).
+    """
+    opts = model._meta
+    event = {
+        'app': opts.app_label,
+        'model': opts.model_name,
+        'action': action,
+        'pks': [str(pk) for pk in pks],
+        'time': time.time(),
+        **extra,
+    }
+    transaction.on_commit(
+        lambda: get_broker().publish(opts.app_label, opts.model_name, event)
+    )
+
+def encode_event(event):
+    return json.dumps(event, cls=DjangoJSONEncoder)
+
+def format_sse(event):
+    return f'id: {event["id"]}\nevent: change\ndata: {encode_event(event)}\n\n'
+
+def format_sse_reset():
+    # The missed events are unknown, the client reloads its data
+    return 'event: reset\ndata: {}\n\n'
@@ -0,0 +1,118 @@
+import math
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models.functions import Centroid, Envelope, GeoFunc
+from django.db.models import FloatField, Value
+from rest_framework.exceptions import ParseError
+
+# Alias of the annotation replacing a geometry column
+ANNOTATION_NAME = '_geom_%s'
+
+
+class SimplifyPreserveTopology(GeoFunc):
+    function = 'ST_SimplifyPreserveTopology'
+    arity = 2
+
+    def __init__(self, expression, tolerance, **extra):
+        super().__init__(expression, Value(tolerance, output_field=FloatField()), **extra)
+
+
+class GeometryOption:
+    """
+    Per-request representation of geometry columns, from the 'geom' query parameter.
+
+    - ``bbox``: the envelope of each geometry
+    - ``simplified:<tolerance>``: ST_SimplifyPreserveTopology with the given tolerance
+    - ``centroid``: the centroid of each geometry
+    - ``none``: geometries are left out
+
+    The geometry columns are deferred and replaced by SQL annotations, so the
+    full geometries are never loaded into Python.
+    """
+    modes = ('bbox', 'simplified', 'centroid', 'none')
+
+    def __init__(self, mode, tolerance=None):
+        self.mode = mode
+        self.tolerance = tolerance
+        self.field_names = []
+
+    @classmethod
+    def parse(cls, value):
+        mode, _, tolerance = value.partition(':')
+
+        if mode not in cls.modes:
+            raise ParseError({
+                'message': 'geom must be one of bbox, simplified:<tolerance>, centroid or none.'
+            })
+
+        if mode == 'simplified':
+            try:
+                tolerance = float(tolerance)
+            except ValueError:
+                raise ParseError({'message': 'Simplification tolerance must be a number.'})
+
+            if not math.isfinite(tolerance):
+                raise ParseError({'message': 'Simplification tolerance must be a finite number.'})
+
+            if tolerance < 0:
+                raise ParseError({'message': 'Simplification tolerance must be positive.'})
+
+            return cls(mode, tolerance)
+
+        return cls(mode)
+
+    def get_expression(self, field_name):
+        if self.mode == 'bbox':
+            return Envelope(field_name)
+        if self.mode == 'centroid':
+            return Centroid(field_name)
+        return SimplifyPreserveTopology(field_name, self.tolerance)
+
+    def apply(self, queryset):
+        """
+        Defer the geometry columns of the queryset and annotate their replacement.
+        """
+        self.field_names = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if isinstance(field, GeometryField)
+        ]
+        if not self.field_names:
+            return queryset
+
+        if self.mode != 'none':
+            queryset = queryset.annotate(**{
+                ANNOTATION_NAME % name: self.get_expression(name)
+                for name in self.field_names
+            })
+
+        return queryset.defer(*self.field_names)
+
+    @property
+    def omitted_field_names(self):
+        """
+        Names of the geometry columns left out of the output, in ``none`` mode.
+        """
+        return self.field_names if self.mode == 'none' else []
+
+    def filter_columns(self, columns):
+        """
+        Drop the omitted geometry columns from (name, getter) column pairs.
+        """
+        omitted = self.omitted_field_names
+        return [column for column in columns if column[0] not in omitted]
+
+    def restore(self, obj):
+        """
+        Put the annotated geometries in place of the deferred columns.
+
+        In ``none`` mode the columns are set to None, so admin methods reading
+        them do not load the deferred geometries one object at a time.
+        """
+        for name in self.field_names:
+            value = None
+            if self.mode != 'none':
+                value = getattr(obj, ANNOTATION_NAME % name)
+
+            # Bypass the geometry descriptor, a centroid does not fit a polygon column
+            obj.__dict__[name] = value
+        return obj
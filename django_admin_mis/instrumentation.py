@@ -0,0 +1,340 @@
+import contextvars
+import functools
+import logging
+import re
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Trace of the request being handled, None when instrumentation is off
+_current_trace = contextvars.ContextVar('admin_mis_trace', default=None)
+
+# Repeated query report: hints naming the admin configuration behind each phase
+PHASE_HINTS = {
+    'serialize': 'Related objects are loaded per row while serializing: add them to '
+                 'list_select_related or select/prefetch them in the ModelAdmin get_queryset.',
+    'inlines': 'Inline objects or their relations are loaded per parent: select/prefetch '
+               'them in the inline get_queryset.',
+    'object': 'Objects are fetched one by one: pass fewer ids per request or override '
+              'the ModelAdmin get_object.',
+    'changelist': 'Queries are repeated while building the ChangeList: check the list_filter '
+                  'classes and the ModelAdmin get_queryset.',
+    'filters': 'Queries are repeated while building the filters: check the list_filter classes.',
+    'fields': 'Queries are repeated while describing the fields: check the form field '
+              'querysets and limit_choices_to.',
+}
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_placeholder_lists = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+
+def is_enabled():
+    return getattr(settings, 'ADMIN_MIS_INSTRUMENTATION', False)
+
+def is_query_debug_enabled():
+    return getattr(settings, 'ADMIN_MIS_QUERY_DEBUG', False)
+
+def fingerprint(sql):
+    """
+    Reduce a query to its shape, without literals and with IN lists collapsed.
+    """
+    sql = _literals.sub('%s', sql)
+    return _placeholder_lists.sub('(%s, ...)', sql)
+
+def get_current_trace():
+    return _current_trace.get()
+
+
+class RequestTrace:
+    """
+    Timings and SQL statistics collected while handling one request.
+
+    Phase durations are inclusive: a phase opened inside another one is
+    counted in both. Queries are attributed to the innermost open phase.
+    With ``debug``, queries are also grouped by fingerprint to detect N+1
+    patterns and slow statements.
+    """
+    def __init__(self, path=None, debug=False):
+        self.path = path
+        self.debug = debug
+        # fingerprint -> {'count', 'time', 'phases', 'sql'}
+        self.shapes = {}
+        self.slow_queries = []
+        self.started = time.perf_counter()
+        self.duration = None
+        self.phases = {}
+        self.phase_queries = {}
+        self.stack = []
+        self.query_count = 0
+        self.db_time = 0.0
+        self.response_bytes = None
+
+    @property
+    def current_phase(self):
+        return self.stack[-1] if self.stack else None
+
+    def add_phase(self, name, duration):
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+    def record_query(self, sql, duration):
+        self.query_count += 1
+        self.db_time += duration
+
+        phase = self.current_phase
+        self.phase_queries[phase] = self.phase_queries.get(phase, 0) + 1
+
+        if self.debug:
+            self.record_shape(sql, duration, phase)
+
+    def record_shape(self, sql, duration, phase):
+        key = fingerprint(sql)
+        shape = self.shapes.get(key)
+        if shape is None:
+            shape = self.shapes[key] = {'count': 0, 'time': 0.0, 'phases': {}, 'sql': sql}
+
+        shape['count'] += 1
+        shape['time'] += duration
+        shape['phases'][phase] = shape['phases'].get(phase, 0) + 1
+
+        if duration * 1000 >= getattr(settings, 'ADMIN_MIS_SLOW_QUERY_MS', 100):
+            self.slow_queries.append({
+                'sql': sql,
+                'time_ms': round(duration * 1000, 2),
+                'phase': phase or 'other',
+            })
+
+    def query_report(self, model_admin=None):
+        """
+        Describe the query shapes repeated beyond ADMIN_MIS_QUERY_DEBUG_THRESHOLD and the slow queries.
+        """
+        threshold = getattr(settings, 'ADMIN_MIS_QUERY_DEBUG_THRESHOLD', 5)
+        repeated = []
+
+        for shape_sql, shape in self.shapes.items():
+            if shape['count'] < threshold:
+                continue
+
+            # The phase issuing most of the repetitions is the one to look at
+            phase = max(shape['phases'], key=shape['phases'].get)
+            repeated.append({
+                'fingerprint': shape_sql,
+                'count': shape['count'],
+                'time_ms': round(shape['time'] * 1000, 2),
+                'phase': phase or 'other',
+                'phases': {name or 'other': count for name, count in shape['phases'].items()},
+                'hint': PHASE_HINTS.get(phase),
+            })
+
+        repeated.sort(key=lambda item: item['count'], reverse=True)
+        report = {
+            'query_count': self.query_count,
+            'db_time_ms': round(self.db_time * 1000, 2),
+            'repeated_queries': repeated,
+            'slow_queries': self.slow_queries,
+        }
+        if model_admin is not None:
+            report['model_admin'] = f'{type(model_admin).__module__}.{type(model_admin).__qualname__}'
+        return report
+
+    def finish(self, response=None):
+        self.duration = time.perf_counter() - self.started
+        if response is not None and not response.streaming:
+            self.response_bytes = len(response.content)
+
+    def server_timing(self):
+        """
+        Return the value of the Server-Timing header, durations in milliseconds.
+        """
+        metrics = [
+            f'total;dur={self.duration * 1000:.2f}',
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries"',
+        ]
+        metrics.extend(
+            f'{name};dur={duration * 1000:.2f}'
+            for name, duration in self.phases.items()
+        )
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        return {
+            'duration_ms': round(self.duration * 1000, 2),
+            'query_count': self.query_count,
+            'db_time_ms': round(self.db_time * 1000, 2),
+            'response_bytes': self.response_bytes,
+            'phases_ms': {
+                name: round(duration * 1000, 2)
+                for name, duration in self.phases.items()
+            },
+            'phase_queries': {
+                name or 'other': count
+                for name, count in self.phase_queries.items()
+            },
+        }
+
+
+class Phase:
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.trace.stack.append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.trace.add_phase(self.name, time.perf_counter() - self.started)
+        self.trace.stack.pop()
+
+
+class NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_null_phase = NullPhase()
+
+def phase(name):
+    """
+    Context manager timing a phase of the current request.
+
+    Does nothing, beyond one context variable lookup, when the request is not traced.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _null_phase
+    return Phase(trace, name)
+
+def timed(name):
+    """
+    Decorator running the decorated function inside ``phase(name)``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with Phase(trace, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def attach_query_report(response, trace, model_admin=None):
+    """
+    Add the query report of the current request to a DRF response.
+
+    Dict payloads get it under a '_debug' key, every response gets a summary header.
+    """
+    report = trace.query_report(model_admin)
+    response['X-Admin-Mis-Queries'] = (
+        f"count={report['query_count']}; repeated={len(report['repeated_queries'])}; "
+        f"slow={len(report['slow_queries'])}"
+    )
+
+    if isinstance(getattr(response, 'data', None), dict):
+        response.data['_debug'] = report
+
+    if report['repeated_queries']:
+        logger.warning(
+            'Repeated queries in %s: %s', trace.path,
+            ', '.join(f"{item['count']}x in {item['phase']}" for item in report['repeated_queries']),
+            extra={'query_report': report},
+        )
+    return response
+
+
+class InstrumentationMiddleware:
+    """
+    Trace each request: query count, DB time, time per phase and response size.
+
+    The results are sent in a Server-Timing header and logged as a structured
+    record on the 'django_admin_mis.instrumentation' logger. Only requests
+    resolved to the admin_mis URLs are reported. The middleware removes itself
+    when both ADMIN_MIS_INSTRUMENTATION and ADMIN_MIS_QUERY_DEBUG are off.
+
+    With ADMIN_MIS_QUERY_DEBUG, queries are fingerprinted and the viewset adds
+    a report of the repeated and slow ones to its responses.
+
+    Under ASGI the middleware runs async. Database connections belong to a
+    thread, and the sync code of a request (sync views, sync_to_async calls,
+    the async ORM) runs in its thread-sensitive executor thread, so the query
+    wrappers are installed on the connections of that thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not (is_enabled() or is_query_debug_enabled()):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def wrap_connections(self, trace):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(trace))
+        return stack
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        trace = RequestTrace(request.path, debug=is_query_debug_enabled())
+        token = _current_trace.set(trace)
+        try:
+            with self.wrap_connections(trace):
+                response = self.get_response(request)
+        finally:
+            _current_trace.reset(token)
+
+        return self.report(request, response, trace)
+
+    async def __acall__(self, request):
+        trace = RequestTrace(request.path, debug=is_query_debug_enabled())
+        token = _current_trace.set(trace)
+        try:
+            stack = await sync_to_async(self.wrap_connections)(trace)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current_trace.reset(token)
+
+        return self.report(request, response, trace)
+
+    def report(self, request, response, trace):
+        match = getattr(request, 'resolver_match', None)
+        if match is None or 'admin_mis' not in match.namespaces:
+            return response
+
+        trace.finish(response)
+        response['Server-Timing'] = trace.server_timing()
+
+        logger.info(
+            'admin_mis %s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'view': match.view_name,
+                'status_code': response.status_code,
+                'trace': trace.as_dict(),
+            }
+        )
+        return response
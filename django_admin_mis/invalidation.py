@@ -0,0 +1,144 @@
+import threading
+import time
+
+from django.apps import apps
+from django.contrib import admin
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .cache import KEY_PREFIX, get_cache
+
+_graph = None
+_graph_lock = threading.Lock()
+
+def get_related_models(model):
+    """
+    Return the models whose rows can change what the admin shows for ``model``:
+    related models in both directions and the auto-created M2M through tables.
+    """
+    related = set()
+    for field in model._meta.get_fields(include_hidden=True):
+        if field.related_model is not None and not isinstance(field.related_model, str):
+            related.add(field.related_model)
+
+        if field.many_to_many:
+            # ManyToManyRel has its own through, ManyToManyField keeps it on remote_field
+            through = getattr(field, 'through', None) or field.remote_field.through
+            if not isinstance(through, str):
+                related.add(through)
+
+    # Proxies and subclasses write through their concrete model
+    return {related_model._meta.concrete_model for related_model in related}
+
+def build_dependency_graph(registry=None):
+    """
+    Map each model to the registered admin models affected by its writes.
+    """
+    registry = admin.site._registry if registry is None else registry
+    graph = {}
+
+    for model in registry:
+        concrete_model = model._meta.concrete_model
+        graph.setdefault(concrete_model, set()).add(model)
+
+        for related_model in get_related_models(model):
+            graph.setdefault(related_model, set()).add(model)
+
+    return graph
+
+def connect_receivers(graph):
+    """
+    Connect the invalidation receivers to the models of ``graph`` and their proxies.
+
+    Writes to the other models send no signal to this app, so their deletes
+    keep the collector's fast path. Auto-created through tables are only
+    written by the related managers, which send m2m_changed.
+    """
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.concrete_model not in graph:
+            continue
+
+        label = model._meta.label_lower
+        if not model._meta.auto_created:
+            post_save.connect(
+                invalidate_on_save, sender=model, dispatch_uid=f'admin_mis_invalidate_save:{label}'
+            )
+            post_delete.connect(
+                invalidate_on_save, sender=model, dispatch_uid=f'admin_mis_invalidate_delete:{label}'
+            )
+        m2m_changed.connect(
+            invalidate_on_m2m_change, sender=model, dispatch_uid=f'admin_mis_invalidate_m2m:{label}'
+        )
+
+def get_dependency_graph():
+    """
+    Return the dependency graph of the registered admin models, connecting
+    the invalidation receivers of its models when it is built.
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                graph = build_dependency_graph()
+                connect_receivers(graph)
+                _graph = graph
+    return _graph
+
+def reset_dependency_graph():
+    global _graph
+    _graph = None
+
+def version_key(model):
+    return f'{KEY_PREFIX}:version:{model._meta.label_lower}'
+
+def get_versions(models):
+    """
+    Return the version counters of ``models``, in one cache round-trip.
+    """
+    cache = get_cache()
+    if cache is None or not models:
+        return ()
+
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # Start from the clock, so an evicted counter never returns to an old value
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return tuple(versions[key] for key in keys)
+
+def bump_versions(model):
+    """
+    Invalidate the cached results of every admin model affected by a write to ``model``.
+    """
+    cache = get_cache()
+    if cache is None:
+        return
+
+    for affected_model in get_dependency_graph().get(model._meta.concrete_model, ()):
+        key = version_key(affected_model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+def invalidate_on_save(sender, raw=False, using=None, **kwargs):
+    """
+    post_save and post_delete receiver.
+
+    The versions are bumped once the transaction commits, so a concurrent
+    request cannot cache the rows from before the write under the new version.
+    """
+    if raw:
+        return
+    transaction.on_commit(lambda: bump_versions(sender), using=using)
+
+def invalidate_on_m2m_change(sender, action, using=None, **kwargs):
+    """
+    m2m_changed receiver, ``sender`` is the through model.
+    """
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: bump_versions(sender), using=using)
@@ -0,0 +1,195 @@
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+from django.db.models.signals import m2m_changed
+from django.forms.models import (ModelMultipleChoiceField,
+                                 apply_limit_choices_to_to_formfield)
+from django.utils import translation
+
+# Rows inserted per query when adding relations
+BULK_CREATE_BATCH_SIZE = 2000
+
+
+class PkMultipleChoiceField(ModelMultipleChoiceField):
+    """
+    ModelMultipleChoiceField cleaning to a set of primary keys.
+
+    The submitted values (``to_field_name`` values when it is set) are
+    validated with a single values_list query instead of loading every
+    selected object, and cleaned to the ``value_field`` of the selected
+    objects: the field a through table stores, the primary key by default.
+    """
+    def __init__(self, queryset, value_field='pk', **kwargs):
+        super().__init__(queryset, **kwargs)
+        self.value_field = value_field
+
+    def clean(self, value):
+        value = self.prepare_value(value)
+        if self.required and not value:
+            raise ValidationError(self.error_messages['required'], code='required')
+        elif not self.required and not value:
+            return set()
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        pks = self._check_values(value)
+        self.run_validators(value)
+        return pks
+
+    def _check_values(self, value):
+        key = self.to_field_name or 'pk'
+        key_field = self.queryset.model._meta.pk if key == 'pk' else self.queryset.model._meta.get_field(key)
+
+        try:
+            value = frozenset(value)
+        except TypeError:
+            # list of lists isn't hashable
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+
+        for pk in value:
+            try:
+                key_field.to_python(pk)
+            except ValidationError:
+                raise ValidationError(
+                    self.error_messages['invalid_pk_value'],
+                    code='invalid_pk_value',
+                    params={'pk': pk},
+                )
+
+        rows = list(
+            self.queryset.filter(**{f'{key}__in': value}).values_list(key, self.value_field)
+        )
+        found = {str(key_value) for key_value, _ in rows}
+        for val in value:
+            if str(val) not in found:
+                raise ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': val},
+                )
+        return {target_value for _, target_value in rows}
+
+
+def get_m2m_diff_fields(request, model_admin, field_names):
+    """
+    Return {name: (model field, PkMultipleChoiceField)} for the fields of
+    ``field_names`` listed in the admin's m2m_diff_fields.
+
+    Fields the admin leaves out of its form (read-only fields, custom
+    through models) are skipped.
+    """
+    diff_fields = {}
+    readonly_fields = model_admin.get_readonly_fields(request)
+
+    for name in getattr(model_admin, 'm2m_diff_fields', ()):
+        if name not in field_names or name in readonly_fields:
+            continue
+
+        db_field = model_admin.model._meta.get_field(name)
+        formfield = model_admin.formfield_for_dbfield(db_field, request)
+        if not isinstance(formfield, ModelMultipleChoiceField):
+            continue
+
+        # The through table references the related objects by this field, whatever to_field_name is
+        through = db_field.remote_field.through
+        target_field = through._meta.get_field(db_field.m2m_reverse_field_name())
+
+        pk_formfield = PkMultipleChoiceField(
+            formfield.queryset,
+            value_field=target_field.target_field.attname,
+            required=formfield.required,
+            widget=formfield.widget,
+            label=formfield.label,
+            to_field_name=formfield.to_field_name,
+            limit_choices_to=formfield.limit_choices_to,
+            validators=formfield.validators,
+        )
+        # As done by BaseModelForm for its own fields
+        apply_limit_choices_to_to_formfield(pk_formfield)
+        diff_fields[name] = (db_field, pk_formfield)
+    return diff_fields
+
+def clean_m2m_diff_fields(diff_fields, data, files):
+    """
+    Clean the submitted values of the diff fields.
+
+    Returns:
+        values (dict): set of through table target values (primary keys) per field name
+        errors (dict): list of messages per field name
+    """
+    values, errors = {}, {}
+    for name, (_, formfield) in diff_fields.items():
+        try:
+            values[name] = formfield.clean(formfield.widget.value_from_datadict(data, files, name))
+        except ValidationError as e:
+            errors[name] = e.messages
+    return values, errors
+
+def save_m2m_diff(instance, db_field, pks):
+    """
+    Make the relations of ``instance`` through ``db_field`` match ``pks``,
+    deleting the removed rows of the through table and bulk inserting
+    the added ones.
+
+    m2m_changed is sent as for ``ManyRelatedManager.set()``.
+    Returns whether any relation changed.
+    """
+    through = db_field.remote_field.through
+    source_field = through._meta.get_field(db_field.m2m_field_name())
+    target_field = through._meta.get_field(db_field.m2m_reverse_field_name())
+    source_value = getattr(instance, source_field.target_field.attname)
+
+    using = router.db_for_write(through, instance=instance)
+    rows = through._default_manager.using(using).filter(**{source_field.attname: source_value})
+
+    existing = set(rows.values_list(target_field.attname, flat=True))
+    removed = existing - pks
+    added = pks - existing
+    if not removed and not added:
+        return False
+
+    signal_kwargs = {
+        'sender': through, 'instance': instance, 'reverse': False,
+        'model': db_field.related_model, 'using': using,
+    }
+
+    if removed:
+        m2m_changed.send(action='pre_remove', pk_set=removed, **signal_kwargs)
+        # A single DELETE while no delete receiver or cascade targets the through model
+        rows.filter(**{f'{target_field.attname}__in': removed}).delete()
+        m2m_changed.send(action='post_remove', pk_set=removed, **signal_kwargs)
+
+    if added:
+        m2m_changed.send(action='pre_add', pk_set=added, **signal_kwargs)
+        through._default_manager.using(using).bulk_create(
+            [
+                through(**{source_field.attname: source_value, target_field.attname: pk})
+                for pk in added
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            # A concurrent save may have added the same relation
+            ignore_conflicts=connections[using].features.supports_ignore_conflicts,
+        )
+        m2m_changed.send(action='post_add', pk_set=added, **signal_kwargs)
+
+    return True
+
+def add_changed_fields_message(change_message, diff_fields, changed_names):
+    """
+    Add the labels of the changed diff fields to the fields of the object's
+    'changed' entry in a construct_change_message() list.
+    """
+    if not changed_names:
+        return change_message
+
+    # Untranslated, as construct_change_message stores them
+    with translation.override(None):
+        labels = [str(diff_fields[name][1].label or name) for name in changed_names]
+
+    for message in change_message:
+        changed = message.get('changed')
+        # Entries naming an object are the inlines'
+        if changed is not None and 'name' not in changed:
+            changed['fields'] = [*changed['fields'], *labels]
+            return change_message
+
+    change_message.insert(0, {'changed': {'fields': labels}})
+    return change_message
@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from django_admin_mis.search import get_indexed_models, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Build or refresh the search index of admins using IndexedSearchAdminMixin.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='Only index these models (default: every indexed model).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Number of objects read and written per query.',
+        )
+
+    def handle(self, *args, **options):
+        indexed_models = get_indexed_models()
+
+        if options['models']:
+            models = []
+            for label in options['models']:
+                try:
+                    model = apps.get_model(label)
+                except (LookupError, ValueError):
+                    raise CommandError(f'Model {label} does not exist.')
+
+                if model not in indexed_models:
+                    raise CommandError(f'The admin of {label} does not use IndexedSearchAdminMixin.')
+                models.append(model)
+        else:
+            models = indexed_models
+
+        for model in models:
+            count = rebuild_index(model, chunk_size=options['chunk_size'])
+            self.stdout.write(f'Indexed {count} {model._meta.label} objects.')
@@ -0,0 +1,66 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+
+from django_admin_mis.warmup import get_warmup_users, warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        'Precompute the admin menu, field and inline schemas and filters of '
+        'registered models, filling the shared cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='Only warm up these models (default: every registered model).',
+        )
+        parser.add_argument(
+            '--user', action='append', dest='users', metavar='USERNAME',
+            help='Warm up the cache entries of this user (default: the first active superuser).',
+        )
+        parser.add_argument(
+            '--host', help='Host the API is served on, part of the cache keys (default: from ALLOWED_HOSTS).',
+        )
+        parser.add_argument(
+            '--secure', action='store_true', help='The API is served over HTTPS.',
+        )
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help=f'Language to warm up (default: {settings.LANGUAGE_CODE}).',
+        )
+
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            models = []
+            for label in options['models']:
+                try:
+                    model = apps.get_model(label)
+                except (LookupError, ValueError):
+                    raise CommandError(f'Model {label} does not exist.')
+
+                if model not in admin.site._registry:
+                    raise CommandError(f'{label} is not registered in the admin site.')
+                models.append(model)
+
+        users = get_warmup_users(options['users'])
+        if not users:
+            raise CommandError('No user to warm up for.')
+
+        results = warm_up(
+            users=users, models=models, host=options['host'],
+            secure=options['secure'], languages=options['languages'],
+        )
+
+        failed = 0
+        for label, action, status_code, seconds in results:
+            if status_code is None or status_code >= 400:
+                failed += 1
+                self.stderr.write(f'{label} {action}: failed ({status_code})')
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'{label} {action}: {seconds * 1000:.0f} ms')
+
+        self.stdout.write(f'Warmed up {len(results) - failed} endpoints for {len(users)} users, {failed} failed.')
@@ -0,0 +1,203 @@
+import bisect
+import hmac
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+# Upper bounds of the histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name: (type, help, buckets)
+METRICS = {
+    'admin_mis_request_duration_seconds': ('histogram', 'Duration of admin API requests.', DURATION_BUCKETS),
+    'admin_mis_request_queries': ('histogram', 'SQL queries issued per admin API request.', QUERY_BUCKETS),
+    'admin_mis_serialized_rows_total': ('counter', 'Rows serialized by admin API requests.', None),
+    'admin_mis_cache_requests_total': ('counter', 'Lookups in the in-process caches of admin_mis.', None),
+}
+
+def is_enabled():
+    return getattr(settings, 'ADMIN_MIS_METRICS', False)
+
+
+class Shard:
+    """
+    Metric values recorded by one thread.
+
+    Only the owning thread writes to a shard, so recording takes no lock.
+    The exposition reads every shard and merges them.
+    """
+    def __init__(self):
+        # (name, labels) -> counter value or [bucket counts..., overflow, sum, count]
+        self.values = {}
+
+    def inc(self, key, amount=1):
+        values = self.values
+        values[key] = values.get(key, 0) + amount
+
+    def observe(self, key, buckets, value):
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [0] * (len(buckets) + 3)
+
+        # Non-cumulative bucket counts, made cumulative on exposition
+        series[bisect.bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+
+_local = threading.local()
+_shards = []
+_shards_lock = threading.Lock()
+
+def get_shard():
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = Shard()
+        with _shards_lock:
+            _shards.append(shard)
+    return shard
+
+def reset():
+    with _shards_lock:
+        for shard in _shards:
+            shard.values = {}
+
+def observe_request(action, app_label, model_name, duration, queries, rows):
+    labels = (('action', action), ('app', app_label), ('model', model_name))
+    shard = get_shard()
+    shard.observe(('admin_mis_request_duration_seconds', labels), DURATION_BUCKETS, duration)
+    shard.observe(('admin_mis_request_queries', labels), QUERY_BUCKETS, queries)
+    if rows:
+        shard.inc(('admin_mis_serialized_rows_total', labels), rows)
+
+def record_cache(cache_name, hit):
+    """
+    Count a lookup in one of the app's caches, when metrics are enabled.
+    """
+    if not is_enabled():
+        return
+    labels = (('cache', cache_name), ('result', 'hit' if hit else 'miss'))
+    get_shard().inc(('admin_mis_cache_requests_total', labels))
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class RequestRecorder:
+    """
+    Context manager measuring the duration and query count of a viewset request.
+    """
+    def __init__(self, view):
+        self.view = view
+        self.queries = QueryCounter()
+
+    def __enter__(self):
+        self.wrapper = connection.execute_wrapper(self.queries)
+        self.wrapper.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.started
+        self.wrapper.__exit__(exc_type, exc_value, traceback)
+
+        # Label with the resolved model only, so unknown URLs do not add series
+        app_label = model_name = ''
+        resolved = getattr(self.view, '_model_register_admin', None)
+        if resolved is not None:
+            app_label = resolved[0]._meta.app_label
+            model_name = resolved[0]._meta.model_name
+
+        observe_request(
+            getattr(self.view, 'action', None) or '',
+            app_label,
+            model_name,
+            duration,
+            self.queries.count,
+            getattr(self.view, 'serialized_rows', 0),
+        )
+
+def collect():
+    """
+    Merge the shards of every thread.
+    """
+    with _shards_lock:
+        shards = list(_shards)
+
+    merged = {}
+    for shard in shards:
+        # dict() copies under the GIL, the owning thread may be writing
+        for key, value in dict(shard.values).items():
+            if isinstance(value, list):
+                value = list(value)
+                current = merged.get(key)
+                if current is not None:
+                    value = [a + b for a, b in zip(current, value)]
+            else:
+                value += merged.get(key, 0)
+            merged[key] = value
+    return merged
+
+def format_labels(labels, extra=()):
+    labels = tuple(labels) + tuple(extra)
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def render_text():
+    """
+    Render the metrics in the Prometheus text exposition format.
+    """
+    merged = collect()
+    lines = []
+
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+
+        series = sorted((labels, value) for (key, labels), value in merged.items() if key == name)
+        for labels, value in series:
+            if metric_type == 'counter':
+                lines.append(f'{name}{format_labels(labels)} {value}')
+                continue
+
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_bucket{format_labels(labels, [("le", "+Inf")])} {value[-1]}')
+            lines.append(f'{name}_sum{format_labels(labels)} {value[-2]}')
+            lines.append(f'{name}_count{format_labels(labels)} {value[-1]}')
+
+    return '\n'.join(lines) + '\n'
+
+def metrics_view(request):
+    """
+    Expose the metrics, to staff users or to scrapers sending ADMIN_MIS_METRICS_TOKEN.
+    """
+    if not is_enabled():
+        return HttpResponseNotFound()
+
+    token = getattr(settings, 'ADMIN_MIS_METRICS_TOKEN', None)
+    if token:
+        authorization = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization, f'Bearer {token}'):
+            return HttpResponseForbidden()
+    elif not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponseForbidden()
+
+    return HttpResponse(render_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 10:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_admin_mis', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255)),
+                ('document', models.TextField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='searchindexentry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['document'], name='admin_mis_search_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddConstraint(
+            model_name='searchindexentry',
+            constraint=models.UniqueConstraint(fields=('content_type', 'object_id'), name='admin_mis_search_entry_unique'),
+        ),
+    ]
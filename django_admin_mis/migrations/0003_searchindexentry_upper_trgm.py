@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_admin_mis', '0002_searchindexentry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchindexentry',
+            name='admin_mis_search_trgm',
+        ),
+        migrations.AddIndex(
+            model_name='searchindexentry',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('document'), name='gin_trgm_ops'), name='admin_mis_search_upper_trgm'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from datetime import date, datetime
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.gis.db import models
 from django.contrib.postgres import fields
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import (FileExtensionValidator, MaxValueValidator,
                                     MinValueValidator, RegexValidator)
+from django.db.models.functions import Upper
 from .validators import ImageValidator
 
 class ForeignModel1(models.Model):
@@ -163,3 +166,29 @@ class AllFieldModel(models.Model):
         verbose_name='Phone Number',
         help_text='Enter your phone number.'
     )
+
+class SearchIndexEntry(models.Model):
+    """
+    Searchable text of an object whose admin uses IndexedSearchAdminMixin.
+    
+    The document joins the values of the admin's search_fields. On PostgreSQL
+    icontains compiles to UPPER("document"::text) LIKE UPPER(%s), so the trigram
+    GIN index is built on UPPER(document) for the planner to use it.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=255)
+    document = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id'],
+                name='admin_mis_search_entry_unique'
+            ),
+        ]
+        indexes = [
+            GinIndex(
+                OpClass(Upper('document'), name='gin_trgm_ops'),
+                name='admin_mis_search_upper_trgm',
+            ),
+        ]
@@ -0,0 +1,149 @@
+import base64
+import datetime
+import decimal
+import uuid
+from importlib.util import find_spec
+
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+# Optional encoders, imported by the first response rendered with them
+HAS_ORJSON = find_spec('orjson') is not None
+HAS_MSGPACK = find_spec('msgpack') is not None
+
+_drf_encoder = encoders.JSONEncoder()
+
+def encode_datetime(value):
+    # Same representation as DRF's JSONEncoder
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+def encode_default(obj, binary=False):
+    """
+    Encode the values orjson and msgpack do not handle natively.
+
+    Mirrors DRF's JSONEncoder, except for the values it cannot encode or
+    mangles: geometries as EWKT, range objects as {lower, upper, bounds} and
+    binary data as base64 (unless ``binary``) instead of decoded as UTF-8.
+    """
+    if isinstance(obj, Promise):
+        return force_str(obj)
+
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+
+    if isinstance(obj, datetime.datetime):
+        return encode_datetime(obj)
+
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        if binary:
+            return bytes(obj)
+        return base64.b64encode(obj).decode('ascii')
+
+    if isinstance(obj, QuerySet):
+        return list(obj)
+
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+
+    if hasattr(obj, 'ewkt'):
+        # GEOSGeometry
+        return obj.ewkt
+
+    if hasattr(obj, 'lower') and hasattr(obj, 'upper') and hasattr(obj, 'bounds'):
+        # psycopg Range
+        return {'lower': obj.lower, 'upper': obj.upper, 'bounds': obj.bounds}
+
+    return _drf_encoder.default(obj)
+
+
+class AdminJSONEncoder(encoders.JSONEncoder):
+    def default(self, obj):
+        return encode_default(obj)
+
+
+class AdminJSONRenderer(JSONRenderer):
+    """
+    DRF's JSON renderer encoding values with encode_default, as ORJSONRenderer does.
+    """
+    encoder_class = AdminJSONEncoder
+
+
+class ORJSONRenderer(AdminJSONRenderer):
+    """
+    JSON renderer backed by orjson, falling back to the json module for
+    payloads orjson rejects (e.g. integers beyond 64 bits).
+
+    The output is the one of AdminJSONRenderer, except for NaN and infinite
+    floats: orjson writes them as null where the json module rejects them
+    (or writes NaN and Infinity when STRICT_JSON is off).
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import orjson
+
+        if data is None:
+            return b''
+
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            return orjson.dumps(data, default=encode_default, option=options)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer, selected with 'Accept: application/msgpack' or '?format=msgpack'.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import msgpack
+
+        if data is None:
+            return b''
+
+        return msgpack.packb(
+            data,
+            default=lambda obj: encode_default(obj, binary=True),
+            use_bin_type=True,
+            datetime=False,
+        )
+
+def get_renderer_classes():
+    """
+    Return DRF's default renderers, with the JSON renderer replaced by
+    ORJSONRenderer (AdminJSONRenderer without orjson) and MessagePackRenderer
+    added when msgpack is installed.
+    """
+    renderer_classes = []
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if renderer_class is JSONRenderer:
+            renderer_class = ORJSONRenderer if HAS_ORJSON else AdminJSONRenderer
+        renderer_classes.append(renderer_class)
+
+    if HAS_MSGPACK:
+        renderer_classes.append(MessagePackRenderer)
+
+    return renderer_classes
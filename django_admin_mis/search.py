@@ -0,0 +1,350 @@
+from collections import defaultdict
+
+from django.contrib import admin
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db.models.functions import Cast
+from django.utils.text import smart_split, unescape_string_literal
+
+# Separates field values in a document so a search term never matches across two fields
+DOCUMENT_SEPARATOR = '\n'
+
+# Related models of the search_fields paths, mapped to the (indexed model,
+# lookup) pairs selecting the objects whose document shows them
+_related_lookups = defaultdict(set)
+
+# Many-to-many tables of the search_fields paths, mapped to the (indexed
+# model, lookup, reverse) triples of the many-to-many fields in the paths
+_m2m_lookups = defaultdict(set)
+
+# Content types known to have index entries, see has_index_entries
+_indexed_content_types = set()
+
+
+class IndexedSearchAdminMixin:
+    """
+    ModelAdmin mixin answering the changelist search ('q') from the search index.
+
+    Each whitespace separated term must appear in one of the search_fields,
+    as with the default admin search. The terms are matched with icontains
+    against a trigram indexed document instead of OR-ing icontains lookups
+    over every field, so the database can use an index scan. The ^, = and @
+    prefixes of search_fields are matched as plain icontains.
+
+    The index is built with ``manage.py adminmis_search_index`` and kept up
+    to date by save and delete receivers connected for the admin's model only:
+    a receiver without sender would disable fast deletes of every model.
+    Saves of the related models in search_fields and changes of their
+    many-to-many tables update the documents showing them. Deletes of related
+    objects, queryset updates and bulk operations send no usable signal; run
+    the command again after them. Until the command has indexed a model, its
+    searches fall back to the default admin search.
+    """
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        label = model._meta.label_lower
+        post_save.connect(update_index, sender=model, dispatch_uid=f'admin_mis_search_update:{label}')
+        post_delete.connect(remove_from_index, sender=model, dispatch_uid=f'admin_mis_search_remove:{label}')
+
+        for lookup, field in get_search_relations(model, get_search_paths(self)):
+            connect_related_receivers(model, lookup, field)
+
+    def get_search_results(self, request, queryset, search_term):
+        if (
+            not search_term
+            or not self.get_search_fields(request)
+            or not has_index_entries(self.model)
+        ):
+            return super().get_search_results(request, queryset, search_term)
+
+        return search_queryset(queryset, search_term), False
+
+
+def get_indexed_models():
+    """
+    Return the models whose registered admin uses IndexedSearchAdminMixin.
+    """
+    return [
+        model for model, model_admin in admin.site._registry.items()
+        if isinstance(model_admin, IndexedSearchAdminMixin)
+    ]
+
+def is_indexed_model(model):
+    return isinstance(admin.site._registry.get(model), IndexedSearchAdminMixin)
+
+def get_search_paths(model_admin):
+    # Strip the lookup prefixes ('^name', '=email', '@body') from search_fields
+    return [
+        field[1:] if field[:1] in ('^', '=', '@') else field
+        for field in model_admin.search_fields
+    ]
+
+def get_search_relations(model, search_paths):
+    """
+    Return the (lookup, field) pairs of the relations followed by ``search_paths``.
+
+    'company__owner__name' gives ('company', Customer.company) and
+    ('company__owner', Company.owner).
+    """
+    relations = []
+    for path in search_paths:
+        opts = model._meta
+        parts = path.split('__')
+        for index, part in enumerate(parts):
+            try:
+                field = opts.get_field(part)
+            except FieldDoesNotExist:
+                break
+
+            if not field.is_relation or field.related_model is None:
+                break
+
+            relations.append(('__'.join(parts[:index + 1]), field))
+            opts = field.related_model._meta
+
+    return relations
+
+def connect_related_receivers(model, lookup, field):
+    """
+    Update the documents of ``model`` when the objects at ``lookup`` change.
+    """
+    related_model = field.related_model
+    _related_lookups[related_model].add((model, lookup))
+    post_save.connect(
+        update_related_index, sender=related_model,
+        dispatch_uid=f'admin_mis_search_related:{related_model._meta.label_lower}'
+    )
+
+    if field.many_to_many:
+        # ManyToManyRel when the path follows the field from its target model
+        reverse = field.auto_created and not field.concrete
+        through = field.through if reverse else field.remote_field.through
+        _m2m_lookups[through].add((model, lookup, reverse))
+        m2m_changed.connect(
+            update_m2m_index, sender=through,
+            dispatch_uid=f'admin_mis_search_m2m:{through._meta.label_lower}'
+        )
+
+def get_lookup_model(model, lookup):
+    # Model reached by following ``lookup`` from ``model``
+    for part in filter(None, lookup.split('__')):
+        model = model._meta.get_field(part).related_model
+    return model
+
+def has_index_entries(model):
+    """
+    Return whether the index has entries of ``model``, i.e. the command ran for it.
+    """
+    from .models import SearchIndexEntry
+
+    content_type = ContentType.objects.get_for_model(model)
+    if content_type.pk in _indexed_content_types:
+        return True
+
+    # Only the positive answer is kept, an index is not emptied while serving
+    if SearchIndexEntry.objects.filter(content_type=content_type).exists():
+        _indexed_content_types.add(content_type.pk)
+        return True
+    return False
+
+def get_path_values(obj, path):
+    """
+    Follow a search_fields path such as 'user__email' and return its values.
+    """
+    values = [obj]
+    for part in path.split('__'):
+        next_values = []
+        for value in values:
+            attr = getattr(value, part, None)
+            if attr is None:
+                continue
+
+            if hasattr(attr, 'all') and callable(attr.all):
+                # Many-to-many and reverse relations
+                next_values.extend(attr.all())
+            else:
+                next_values.append(attr)
+        values = next_values
+
+    return [str(value) for value in values]
+
+def build_document(obj, search_paths):
+    values = []
+    for path in search_paths:
+        values.extend(get_path_values(obj, path))
+    return DOCUMENT_SEPARATOR.join(values)
+
+def index_object(obj, model_admin=None):
+    from .models import SearchIndexEntry
+
+    model_admin = model_admin or admin.site._registry[type(obj)]
+    SearchIndexEntry.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(obj),
+        object_id=str(obj.pk),
+        defaults={
+            'document': build_document(obj, get_search_paths(model_admin)),
+        }
+    )
+
+def unindex_object(obj):
+    from .models import SearchIndexEntry
+
+    SearchIndexEntry.objects.filter(
+        content_type=ContentType.objects.get_for_model(obj),
+        object_id=str(obj.pk),
+    ).delete()
+
+def index_queryset(queryset, chunk_size=2000):
+    """
+    Index the objects of ``queryset`` in chunks. Returns their number.
+    """
+    from .models import SearchIndexEntry
+
+    model = queryset.model
+    search_paths = get_search_paths(admin.site._registry[model])
+    content_type = ContentType.objects.get_for_model(model)
+
+    def write(entries):
+        SearchIndexEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['content_type', 'object_id'],
+            update_fields=['document'],
+        )
+
+    count = 0
+    entries = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        entries.append(SearchIndexEntry(
+            content_type=content_type,
+            object_id=str(obj.pk),
+            document=build_document(obj, search_paths),
+        ))
+        count += 1
+
+        if len(entries) >= chunk_size:
+            write(entries)
+            entries = []
+
+    if entries:
+        write(entries)
+
+    return count
+
+def rebuild_index(model, chunk_size=2000):
+    """
+    Index every object of ``model`` and drop the entries of deleted objects.
+
+    Returns the number of indexed objects.
+    """
+    from .models import SearchIndexEntry
+
+    count = index_queryset(model._default_manager.all(), chunk_size=chunk_size)
+    content_type = ContentType.objects.get_for_model(model)
+
+    existing_ids = model._default_manager.annotate(
+        indexed_id=Cast('pk', output_field=CharField())
+    ).values('indexed_id')
+    SearchIndexEntry.objects.filter(content_type=content_type).exclude(
+        object_id__in=existing_ids
+    ).delete()
+
+    return count
+
+def search_queryset(queryset, search_term):
+    """
+    Restrict ``queryset`` to the objects whose document contains every search term.
+    """
+    from .models import SearchIndexEntry
+
+    model = queryset.model
+    entries = SearchIndexEntry.objects.filter(
+        content_type=ContentType.objects.get_for_model(model)
+    )
+
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        entries = entries.filter(document__icontains=bit)
+
+    pk_field = model._meta.pk
+    if pk_field.is_relation:
+        pk_field = pk_field.target_field
+
+    object_ids = entries.annotate(
+        indexed_pk=Cast('object_id', output_field=pk_field.__class__())
+    ).values('indexed_pk')
+    return queryset.filter(pk__in=object_ids)
+
+def update_index(sender, instance, raw=False, **kwargs):
+    """
+    post_save receiver keeping the document of indexed models up to date.
+
+    Models are left out until the command indexed them, so their searches
+    keep falling back to the admin search rather than miss older objects.
+    """
+    if raw or not is_indexed_model(sender) or not has_index_entries(sender):
+        return
+    index_object(instance)
+
+def remove_from_index(sender, instance, **kwargs):
+    """
+    post_delete receiver dropping the document of deleted objects.
+    """
+    if not is_indexed_model(sender):
+        return
+    unindex_object(instance)
+
+def update_related_index(sender, instance, raw=False, **kwargs):
+    """
+    post_save receiver of the related models, updating the documents showing ``instance``.
+    """
+    if raw:
+        return
+
+    for model, lookup in _related_lookups.get(sender, ()):
+        if is_indexed_model(model) and has_index_entries(model):
+            index_queryset(model._default_manager.filter(**{lookup: instance}).distinct())
+
+def update_m2m_index(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    m2m_changed receiver of the many-to-many tables in search_fields.
+
+    Objects are added to their many-to-many fields after post_save, so the
+    documents are updated again once the table is written.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+
+    for model, lookup, field_reverse in _m2m_lookups.get(sender, ()):
+        if not is_indexed_model(model) or not has_index_entries(model):
+            continue
+
+        # The owners hold the many-to-many field, at owner_lookup ('' for model itself)
+        owner_lookup, _, field_name = lookup.rpartition('__')
+        # Signals are sent from the side the relation was written from
+        instance_is_owner = reverse == field_reverse
+
+        if action == 'pre_clear':
+            if not instance_is_owner:
+                # pk_set is None on clear, read the owners before the rows go
+                owner_model = get_lookup_model(model, owner_lookup)
+                cleared_owners = instance.__dict__.setdefault('_admin_mis_cleared_owners', {})
+                cleared_owners[lookup] = list(
+                    owner_model._default_manager.filter(**{field_name: instance})
+                    .values_list('pk', flat=True)
+                )
+            continue
+
+        if instance_is_owner:
+            owner_pks = [instance.pk]
+        elif action == 'post_clear':
+            owner_pks = instance.__dict__.get('_admin_mis_cleared_owners', {}).pop(lookup, [])
+        else:
+            owner_pks = list(pk_set)
+
+        if owner_pks:
+            owners = f'{owner_lookup}__in' if owner_lookup else 'pk__in'
+            index_queryset(model._default_manager.filter(**{owners: owner_pks}).distinct())
@@ -24,9 +24,11 @@ class DynamicSerializer(serializers.ModelSerializer):
         if not model:
             raise ValueError('The "model" parameter should not be empty.')  # Improved error message
         
-        self.Meta.model = model
-        if fields:
-            self.Meta.fields = fields
+        # Build a Meta per instance, the class level one is shared between requests
+        self.Meta = type('Meta', (), {
+            'model': model,
+            'fields': fields or '__all__',
+        })
             
         super().__init__(*args, **kwargs)
         
@@ -0,0 +1,248 @@
+import csv
+import mimetypes
+import os
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .utils import is_asgi_request
+
+# Rows written per chunk of the streamed response
+ROWS_PER_CHUNK = 100
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder falling back to str() for values such as geometries.
+    """
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+class Echo:
+    """
+    File-like object returning what is written, for csv.writer.
+    """
+    def write(self, value):
+        return value
+
+
+async def aiter_chunks(iterator):
+    """
+    Yield the chunks of a sync iterator, reading one chunk per thread hop.
+
+    Under ASGI, StreamingHttpResponse consumes a sync iterator with
+    ``sync_to_async(list)``, loading the whole body in memory first. The
+    chunks are read in the request's thread-sensitive thread, which owns the
+    database connection of server-side cursors.
+    """
+    iterator = iter(iterator)
+    get_next = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while True:
+            chunk = await get_next(iterator, done)
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+def streaming_response(request, iterator, **kwargs):
+    """
+    StreamingHttpResponse reading ``iterator`` chunk by chunk under both WSGI and ASGI.
+    """
+    if is_asgi_request(request):
+        iterator = aiter_chunks(iterator)
+    return StreamingHttpResponse(iterator, **kwargs)
+
+def iter_rows(queryset, columns, chunk_size, prepare=None):
+    """
+    Yield each object of the queryset as a tuple of column values.
+    
+    ``prepare`` is called with each object before its columns are read.
+    """
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        if prepare is not None:
+            prepare(obj)
+        yield tuple(get_value(obj) for _, get_value in columns)
+
+def iter_csv(queryset, columns, chunk_size, prepare=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in columns])
+
+    lines = []
+    for row in iter_rows(queryset, columns, chunk_size, prepare):
+        lines.append(writer.writerow(row))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ''.join(lines)
+            lines = []
+
+    if lines:
+        yield ''.join(lines)
+
+def iter_ndjson(queryset, columns, chunk_size, prepare=None):
+    names = [name for name, _ in columns]
+    encoder = ExportJSONEncoder()
+
+    lines = []
+    for row in iter_rows(queryset, columns, chunk_size, prepare):
+        lines.append(encoder.encode(dict(zip(names, row))) + '\n')
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ''.join(lines)
+            lines = []
+
+    if lines:
+        yield ''.join(lines)
+
+# Supported export formats: (row writer, content type, file extension)
+EXPORT_FORMATS = {
+    'csv': (iter_csv, 'text/csv', 'csv'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson', 'ndjson'),
+}
+
+def export_response(request, queryset, columns, file_format, filename, chunk_size, prepare=None):
+    """
+    Stream every object of the queryset in the given format.
+
+    Rows are read with a server-side cursor through `queryset.iterator()`,
+    so memory use does not depend on the number of exported rows.
+    """
+    writer, content_type, extension = EXPORT_FORMATS[file_format]
+
+    response = streaming_response(
+        request,
+        writer(queryset, columns, chunk_size, prepare),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{extension}"'
+    return response
+
+# Bytes read from storage or memory per chunk of a download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def parse_range_header(header, size):
+    """
+    Parse a single 'bytes=' range of a Range header against a content of ``size`` bytes.
+
+    Returns None when the header is missing, invalid (e.g. its last byte is
+    before its first one) or asks for several ranges, in which case the whole
+    content is sent as RFC 9110 allows; the (start, end) inclusive offsets of
+    a satisfiable range; or False when it cannot be satisfied (416).
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+
+    ranges = header[len('bytes='):].split(',')
+    if len(ranges) != 1:
+        return None
+
+    start, _, end = ranges[0].strip().partition('-')
+    try:
+        if not start:
+            # Suffix range, the last 'end' bytes
+            length = int(end)
+            if length < 0:
+                return None
+            if length == 0 or size == 0:
+                return False
+            return max(size - length, 0), size - 1
+
+        start = int(start)
+        end = int(end) if end else None
+    except ValueError:
+        return None
+
+    if start < 0 or (end is not None and start > end):
+        return None
+
+    if start >= size:
+        return False
+
+    return start, size - 1 if end is None else min(end, size - 1)
+
+def iter_file_range(open_file, start, length, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Yield ``length`` bytes from ``start`` of the file returned by ``open_file()``.
+
+    The file is opened on the first read, so a response whose body is never
+    iterated (the client went away, an error was sent instead) holds no handle.
+    """
+    file = open_file()
+    try:
+        file.seek(start)
+        while length > 0:
+            data = file.read(min(chunk_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        file.close()
+
+def iter_bytes_range(data, start, length, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    view = memoryview(data)
+    for offset in range(start, start + length, chunk_size):
+        yield view[offset:min(offset + chunk_size, start + length)]
+
+def download_response(request, size, iter_range, filename, content_type=None):
+    """
+    Stream ``size`` bytes, answering a Range request with 206 Partial Content.
+
+    ``iter_range(start, length)`` yields the requested bytes.
+    """
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        start, end = 0, size - 1
+        response = streaming_response(request, iter_range(0, size), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = streaming_response(
+            request,
+            iter_range(start, end - start + 1),
+            content_type=content_type,
+            status=206,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Content-Length'] = str(max(end - start + 1, 0))
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+def field_file_response(request, field_file):
+    """
+    Stream the content of a FileField/ImageField value from its storage.
+    """
+    size = field_file.size
+    filename = os.path.basename(field_file.name)
+
+    def iter_range(start, length):
+        return iter_file_range(
+            lambda: field_file.storage.open(field_file.name, 'rb'), start, length
+        )
+
+    return download_response(request, size, iter_range, filename)
+
+def binary_response(request, data, filename):
+    """
+    Stream the content of a BinaryField value.
+    """
+    def iter_range(start, length):
+        return iter_bytes_range(data, start, length)
+
+    return download_response(request, len(data), iter_range, filename)
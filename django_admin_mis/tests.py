@@ -1,3 +1,1038 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+import json
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import ArrayField
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.validators import MinValueValidator, RegexValidator
+from django.db import models
+from django.db.models.signals import m2m_changed
+from django.forms import ModelMultipleChoiceField
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from . import events, search, throttling
+from .cache import get_cached_count, get_or_compute, make_key
+from .invalidation import (bump_versions, get_dependency_graph, get_versions,
+                           reset_dependency_graph)
+from .m2m import PkMultipleChoiceField, save_m2m_diff
+from .renderers import HAS_ORJSON, AdminJSONRenderer, ORJSONRenderer
+from .search import get_lookup_model, get_search_relations
+from .streaming import binary_response, iter_file_range, parse_range_header
+from .throttling import (AdminCostThrottle, acquire_concurrency_slot, exempt_request,
+                         get_throttle_cost)
+from .utils import describe_validator, format_field_name
+from .validators import MAX_HEADER_BYTES, read_image_dimensions
+from .views import AdminModelViewSet
+from .warmup import warm_up_process
+
+
+class AdminAPITestCase(TestCase):
+    """
+    Requests of a superuser against the admin API of django.contrib.auth models.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def url(self, action, app_name='auth', model_name='group', **kwargs):
+        return reverse(
+            f'admin_mis:admin-{action}',
+            kwargs={'app_name': app_name, 'model_name': model_name, **kwargs}
+        )
+
+
+class ImportTimeTests(SimpleTestCase):
+    """
+    Guards the import cost of the views, measured with ``python -X importtime``.
+    """
+    def get_imported_modules(self, code):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        # Lines read "import time: self [us] | cumulative | imported package"
+        return {
+            line.rsplit('|', 1)[-1].strip()
+            for line in result.stderr.splitlines()
+            if line.startswith('import time:')
+        }
+
+    def test_views_do_not_import_admin_list_or_test_tooling(self):
+        imported = self.get_imported_modules('import django; django.setup(); import django_admin_mis.views')
+
+        self.assertIn('django_admin_mis.views', imported)
+        self.assertNotIn('django.contrib.admin.templatetags.admin_list', imported)
+        self.assertNotIn('rest_framework.test', imported)
+
+    def test_views_defer_feature_modules(self):
+        imported = self.get_imported_modules('import django; django.setup(); import django_admin_mis.views')
+
+        # Optional encoders are imported by the first response using them
+        for name in ('orjson', 'msgpack'):
+            self.assertNotIn(name, imported)
+
+        # Feature modules are imported by the first request using them
+        for name in ('events', 'geometry', 'invalidation', 'm2m', 'streaming'):
+            self.assertNotIn(f'django_admin_mis.{name}', imported)
+
+
+class ChangeFeedTests(AdminAPITestCase):
+    def log(self, obj, action_flag, **kwargs):
+        return LogEntry.objects.create(
+            user=self.superuser, content_type=ContentType.objects.get_for_model(obj),
+            object_id=str(obj.pk), object_repr=str(obj), action_flag=action_flag, **kwargs
+        )
+
+    def get_changes(self, since=None):
+        params = {} if since is None else {'since': since}
+        response = self.client.get(self.url('list-changes-data'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_without_since(self):
+        group = Group.objects.create(name='editors')
+        entry = self.log(group, ADDITION)
+
+        self.assertEqual(self.get_changes(), {'cursor': entry.pk, 'changes': [], 'has_more': False})
+
+    def test_added_then_changed_is_reported_as_added(self):
+        cursor = self.get_changes()['cursor']
+        group = Group.objects.create(name='editors')
+        self.log(group, ADDITION)
+        self.log(group, CHANGE)
+
+        changes = self.get_changes(cursor)['changes']
+        self.assertEqual([(c['pk'], c['action']) for c in changes], [(str(group.pk), 'added')])
+        self.assertEqual(changes[0]['data']['id'], group.pk)
+
+    def test_deleted_and_hidden_objects(self):
+        cursor = self.get_changes()['cursor']
+        deleted = Group.objects.create(name='deleted')
+        hidden = Group.objects.create(name='hidden')
+        self.log(deleted, DELETION)
+        self.log(hidden, CHANGE)
+        deleted_pk = str(deleted.pk)
+        deleted.delete()
+
+        model_admin = admin.site._registry[Group]
+        with mock.patch.object(model_admin, 'get_queryset', return_value=Group.objects.exclude(name='hidden')):
+            changes = self.get_changes(cursor)['changes']
+
+        self.assertEqual(
+            [(c['pk'], c['action'], c['data']) for c in changes],
+            [(deleted_pk, 'deleted', None), (str(hidden.pk), 'removed', None)]
+        )
+
+    def test_entries_committed_below_the_cursor_are_read_again(self):
+        early = Group.objects.create(name='early')
+        late = Group.objects.create(name='late')
+        reserved = self.log(early, ADDITION)
+        self.log(early, CHANGE)
+        cursor = self.get_changes()['cursor']
+
+        # A transaction holding a lower id commits after the client read the cursor
+        late_id = reserved.pk
+        reserved.delete()
+        self.log(late, ADDITION, id=late_id)
+
+        data = self.get_changes(cursor)
+        self.assertEqual(data['cursor'], cursor)
+        self.assertIn((str(late.pk), 'added'), [(c['pk'], c['action']) for c in data['changes']])
+
+        with self.settings(ADMIN_MIS_CHANGES_OVERLAP=0):
+            self.assertEqual(self.get_changes(cursor)['changes'], [])
+
+    def test_limit_and_has_more(self):
+        cursor = self.get_changes()['cursor']
+        groups = [Group.objects.create(name=f'group {i}') for i in range(3)]
+        for group in groups:
+            self.log(group, ADDITION)
+
+        with self.settings(ADMIN_MIS_CHANGES_OVERLAP=0):
+            response = self.client.get(self.url('list-changes-data'), {'since': cursor, 'limit': 2})
+            data = response.json()
+            self.assertTrue(data['has_more'])
+            self.assertEqual(len(data['changes']), 2)
+
+            data = self.get_changes(data['cursor'])
+            self.assertFalse(data['has_more'])
+            self.assertEqual([c['pk'] for c in data['changes']], [str(groups[2].pk)])
+
+
+class M2MDiffTests(AdminAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.group = Group.objects.create(name='editors')
+        cls.permissions = list(Permission.objects.order_by('pk')[:4])
+        cls.group.permissions.set(cls.permissions[:2])
+
+    def setUp(self):
+        super().setUp()
+        self.signals = []
+        m2m_changed.connect(self.record_signal, sender=Group.permissions.through)
+        self.addCleanup(m2m_changed.disconnect, self.record_signal, sender=Group.permissions.through)
+
+    def record_signal(self, sender, **kwargs):
+        kwargs.pop('signal')
+        self.signals.append(kwargs)
+
+    def pks(self, permissions):
+        return {permission.pk for permission in permissions}
+
+    def test_add_and_remove(self):
+        field = Group._meta.get_field('permissions')
+        wanted = self.pks(self.permissions[1:3])
+
+        self.assertTrue(save_m2m_diff(self.group, field, wanted))
+        self.assertEqual(self.pks(self.group.permissions.all()), wanted)
+
+        common = {'instance': self.group, 'reverse': False, 'model': Permission, 'using': 'default'}
+        self.assertEqual(self.signals, [
+            {'action': 'pre_remove', 'pk_set': {self.permissions[0].pk}, **common},
+            {'action': 'post_remove', 'pk_set': {self.permissions[0].pk}, **common},
+            {'action': 'pre_add', 'pk_set': {self.permissions[2].pk}, **common},
+            {'action': 'post_add', 'pk_set': {self.permissions[2].pk}, **common},
+        ])
+
+    def test_no_change(self):
+        field = Group._meta.get_field('permissions')
+
+        with self.assertNumQueries(1):
+            self.assertFalse(save_m2m_diff(self.group, field, self.pks(self.permissions[:2])))
+        self.assertEqual(self.signals, [])
+
+    def test_clean_to_field_name_values_to_primary_keys(self):
+        formfield = PkMultipleChoiceField(Permission.objects.all(), to_field_name='codename')
+        codenames = [permission.codename for permission in self.permissions[:2]]
+
+        self.assertEqual(formfield.clean(codenames), self.pks(self.permissions[:2]))
+        with self.assertRaises(ValidationError):
+            formfield.clean(['not-a-codename'])
+
+    def test_change_endpoint(self):
+        model_admin = admin.site._registry[Group]
+        wanted = self.permissions[2:]
+
+        with mock.patch.object(model_admin, 'm2m_diff_fields', ['permissions'], create=True):
+            response = self.client.patch(
+                self.url('patch-data', pk=self.group.pk),
+                {'name': 'editors', 'permissions': [permission.pk for permission in wanted]},
+                content_type='application/json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.pks(self.group.permissions.all()), self.pks(wanted))
+        self.assertEqual(len(self.signals), 4)
+
+        entry = LogEntry.objects.get(action_flag=CHANGE)
+        self.assertEqual(entry.get_change_message(), 'Changed Permissions.')
+
+    def test_change_endpoint_validation(self):
+        model_admin = admin.site._registry[Group]
+
+        with mock.patch.object(model_admin, 'm2m_diff_fields', ['permissions'], create=True):
+            response = self.client.patch(
+                self.url('patch-data', pk=self.group.pk),
+                {'name': 'editors', 'permissions': [0]},
+                content_type='application/json',
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('permissions', response.json())
+        self.assertEqual(self.pks(self.group.permissions.all()), self.pks(self.permissions[:2]))
+
+
+@override_settings(
+    ADMIN_MIS_CACHE='admin_mis_tests',
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'admin_mis_tests': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'admin-mis-tests',
+        },
+    },
+)
+class CacheTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = caches['admin_mis_tests']
+        self.cache.clear()
+
+    def test_single_flight(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('menu', ('key',), compute)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 3)
+        self.assertEqual(len(calls), 1)
+
+    def test_no_wait_computes_at_once(self):
+        lock_key = make_key('menu', 'key') + ':lock'
+        self.cache.add(lock_key, 'other worker', 30)
+
+        started = time.monotonic()
+        self.assertEqual(get_or_compute('menu', ('key',), lambda: 'value', wait=False), 'value')
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_lock_of_another_worker_is_kept(self):
+        lock_key = make_key('menu', 'key') + ':lock'
+
+        def compute():
+            # This worker's lock expired and another worker took it
+            self.cache.set(lock_key, 'other worker', 30)
+            return 'value'
+
+        get_or_compute('menu', ('key',), compute)
+        self.assertEqual(self.cache.get(lock_key), 'other worker')
+
+    def test_unpicklable_results_are_not_retried(self):
+        with self.assertLogs('django_admin_mis.cache', 'WARNING'):
+            get_or_compute('menu', ('key',), lambda: lambda: None)
+
+        calls = []
+        with self.assertNoLogs('django_admin_mis.cache', 'WARNING'):
+            get_or_compute('menu', ('key',), lambda: calls.append(1) or (lambda: None))
+        self.assertEqual(calls, [1])
+
+    def test_count_is_versioned(self):
+        queryset = Group.objects.all()
+        self.assertEqual(get_cached_count(queryset), 0)
+
+        Group.objects.create(name='editors')
+        self.assertEqual(get_cached_count(queryset), 0)
+
+        bump_versions(Group)
+        self.assertEqual(get_cached_count(queryset), 1)
+
+    def test_writes_bump_versions_on_commit(self):
+        reset_dependency_graph()
+        self.addCleanup(reset_dependency_graph)
+        get_dependency_graph()
+
+        versions = get_versions([Group, User])
+        with self.captureOnCommitCallbacks(execute=True):
+            group = Group.objects.create(name='editors')
+            self.assertEqual(get_versions([Group, User]), versions)
+
+        # Users reference groups through their many-to-many field
+        self.assertNotEqual(get_versions([Group]), versions[:1])
+        self.assertNotEqual(get_versions([User]), versions[1:])
+
+        versions = get_versions([User])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.superuser.groups.add(group)
+        self.assertNotEqual(get_versions([User]), versions)
+
+    def test_cached_fields_describe_callable_defaults_per_request(self):
+        url = self.url('list-field-meta', model_name='user')
+        with mock.patch('django_admin_mis.utils.get_default_value', return_value='now') as get_default_value:
+            first = self.client.get(url).json()
+            second = self.client.get(url).json()
+
+        self.assertEqual(first, second)
+        # date_joined defaults to timezone.now, described again on the cache hit
+        self.assertTrue(get_default_value.called)
+        date_joined = next(field for field in second['fields'] if field['name'] == 'date_joined')
+        self.assertEqual(date_joined['defaults'], 'now')
+
+
+class FakeGeometry:
+    # Stands for a GEOSGeometry, which needs the GEOS library
+    ewkt = 'SRID=4326;POINT (1 2)'
+
+
+class RendererTests(SimpleTestCase):
+    payload = {
+        'text': gettext_lazy('Groups'),
+        'date': datetime.date(2024, 1, 2),
+        'time': datetime.time(3, 4, 5),
+        'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        'local_datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, 678000),
+        'duration': datetime.timedelta(minutes=1, seconds=30),
+        'decimal': decimal.Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'tuple': (1, 'a'),
+        'nested': [{'a': [1.5, None, True]}],
+    }
+
+    def render(self, renderer_class, data):
+        return json.loads(renderer_class().render(data, 'application/json', {}))
+
+    def test_admin_renderer_matches_drf(self):
+        self.assertEqual(
+            self.render(AdminJSONRenderer, self.payload), self.render(JSONRenderer, self.payload)
+        )
+
+    def test_extra_representations(self):
+        data = {'geometry': FakeGeometry(), 'binary': b'\x00\xff', 'set': {1}}
+        self.assertEqual(
+            self.render(AdminJSONRenderer, data),
+            {'geometry': FakeGeometry.ewkt, 'binary': 'AP8=', 'set': [1]}
+        )
+
+    @unittest.skipUnless(HAS_ORJSON, 'orjson is not installed')
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {**self.payload, 'geometry': FakeGeometry(), 'binary': b'\x00\xff', 'big': 2 ** 70}
+        self.assertEqual(self.render(ORJSONRenderer, data), self.render(AdminJSONRenderer, data))
+
+    @unittest.skipUnless(HAS_ORJSON, 'orjson is not installed')
+    def test_non_finite_floats(self):
+        data = {'nan': float('nan'), 'inf': float('inf')}
+        self.assertEqual(self.render(ORJSONRenderer, data), {'nan': None, 'inf': None})
+        with self.assertRaises(ValueError):
+            AdminJSONRenderer().render(data, 'application/json', {})
+
+
+class RangeTests(SimpleTestCase):
+    def test_parse_range_header(self):
+        cases = [
+            (None, None),
+            ('items=0-10', None),
+            ('bytes=0-9', (0, 9)),
+            ('bytes=10-', (10, 99)),
+            ('bytes=-10', (90, 99)),
+            ('bytes=-500', (0, 99)),
+            ('bytes=90-500', (90, 99)),
+            ('bytes=0-9, 20-29', None),
+            ('bytes=9-0', None),
+            ('bytes=a-b', None),
+            ('bytes=100-', False),
+            ('bytes=200-300', False),
+            ('bytes=-0', False),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range_header(header, 100), expected)
+
+    def test_empty_content(self):
+        self.assertIs(parse_range_header('bytes=-10', 0), False)
+        self.assertIs(parse_range_header('bytes=0-', 0), False)
+
+    def request(self, header=None):
+        extra = {'HTTP_RANGE': header} if header else {}
+        return RequestFactory().get('/', **extra)
+
+    def test_binary_response(self):
+        data = bytes(range(100))
+
+        response = binary_response(self.request(), data, 'data.bin')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), data)
+        self.assertEqual(response['Content-Length'], '100')
+
+        response = binary_response(self.request('bytes=10-19'), data, 'data.bin')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(b''.join(response.streaming_content), data[10:20])
+
+        response = binary_response(self.request('bytes=9-0'), data, 'data.bin')
+        self.assertEqual(response.status_code, 200)
+
+        response = binary_response(self.request('bytes=100-'), data, 'data.bin')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_file_opened_lazily(self):
+        file = mock.Mock(read=mock.Mock(side_effect=[b'abc', b'']))
+        open_file = mock.Mock(return_value=file)
+
+        iterator = iter_file_range(open_file, 5, 10)
+        iterator.close()
+        open_file.assert_not_called()
+
+        self.assertEqual(list(iter_file_range(open_file, 5, 10)), [b'abc'])
+        file.seek.assert_called_once_with(5)
+        file.close.assert_called_once_with()
+
+
+class EstimatedCountPaginator(Paginator):
+    count = 42
+
+
+class AsyncViewTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_client.force_login(self.superuser)
+        Group.objects.bulk_create([Group(name=f'group {i}') for i in range(3)])
+
+    async def test_list_uses_admin_paginator(self):
+        url = reverse(
+            'admin_mis:async-list-display-data', kwargs={'app_name': 'auth', 'model_name': 'group'}
+        )
+        model_admin = admin.site._registry[Group]
+        with mock.patch.object(model_admin, 'paginator', EstimatedCountPaginator), \
+                mock.patch.object(model_admin, 'list_per_page', 2):
+            response = await self.async_client.get(url)
+            sync_response = await sync_to_async(self.client.get)(self.url('list-display-data'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response.json()['count'], 42)
+        self.assertEqual(len(response.json()['data']), 2)
+
+
+class SearchRelationTests(SimpleTestCase):
+    def test_search_relations(self):
+        relations = get_search_relations(
+            User, ['username', 'groups__name', 'groups__permissions__codename', 'missing__name']
+        )
+        self.assertEqual(
+            [(lookup, field) for lookup, field in relations],
+            [
+                ('groups', User._meta.get_field('groups')),
+                ('groups', User._meta.get_field('groups')),
+                ('groups__permissions', Group._meta.get_field('permissions')),
+            ]
+        )
+
+    def test_reverse_relations(self):
+        (lookup, field), = get_search_relations(Group, ['user__username'])
+        self.assertEqual(lookup, 'user')
+        self.assertTrue(field.many_to_many)
+        self.assertIs(field.related_model, User)
+        self.assertIs(get_lookup_model(Permission, 'group__user'), User)
+
+
+class SearchReceiverTests(TestCase):
+    """
+    Objects reindexed by the many-to-many receiver, for User.groups in search_fields.
+    """
+    def setUp(self):
+        self.user = User.objects.create(username='user')
+        self.group = Group.objects.create(name='group')
+
+        lookups = {User.groups.through: {(User, 'groups', False)}}
+        for target, value in [
+            ('_m2m_lookups', lookups),
+            ('is_indexed_model', lambda model: True),
+            ('has_index_entries', lambda model: True),
+        ]:
+            patcher = mock.patch.object(search, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.indexed = []
+        patcher = mock.patch.object(
+            search, 'index_queryset', lambda queryset: self.indexed.append(list(queryset))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        m2m_changed.connect(search.update_m2m_index, sender=User.groups.through)
+        self.addCleanup(m2m_changed.disconnect, search.update_m2m_index, sender=User.groups.through)
+
+    def test_forward_changes(self):
+        self.user.groups.add(self.group)
+        self.user.groups.remove(self.group)
+        self.assertEqual(self.indexed, [[self.user], [self.user]])
+
+    def test_reverse_changes(self):
+        self.group.user_set.add(self.user)
+        self.group.user_set.clear()
+        self.assertEqual(self.indexed, [[self.user], [self.user]])
+
+
+class WarmUpTests(AdminAPITestCase):
+    def test_process_warm_up_builds_no_changelist(self):
+        with mock.patch('django.contrib.admin.views.main.ChangeList.__init__') as init:
+            warmed = warm_up_process(self.superuser, models=[Group, User], host='testserver')
+
+        self.assertEqual(warmed, ['auth.Group', 'auth.User'])
+        init.assert_not_called()
+
+
+@override_settings(
+    ADMIN_MIS_CACHE='admin_mis_tests',
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'admin_mis_tests': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'admin-mis-throttle-tests',
+        },
+    },
+)
+class ThrottleTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        caches['admin_mis_tests'].clear()
+        self.now = 600.0
+        for target, attribute, value in [
+            (AdminCostThrottle, 'timer', lambda throttle: self.now),
+            # Per-process backend, built again with the settings of each test
+            (throttling, '_backend', None),
+        ]:
+            patcher = mock.patch.object(target, attribute, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def view(self, cost=1):
+        return mock.Mock(action='list_display_data', get_throttle_cost=lambda request: cost)
+
+    def request(self):
+        request = RequestFactory().get('/')
+        request.user = self.superuser
+        return request
+
+    def test_costs(self):
+        self.assertEqual(get_throttle_cost('list_display_data', 100), 1)
+        self.assertEqual(get_throttle_cost('delete_objects', 250), 6)
+        self.assertEqual(get_throttle_cost('export_data', 200), 40)
+        self.assertEqual(get_throttle_cost('lookup_data'), 1)
+        with override_settings(ADMIN_MIS_THROTTLE_COSTS={'export_data': 1}):
+            self.assertEqual(get_throttle_cost('export_data', 200), 2)
+
+    @override_settings(ADMIN_MIS_THROTTLE_RATES={'default': '3/min'})
+    def test_rate_and_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 200)
+
+        response = self.client.get(self.url('list-display-data'))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+        self.now += 30
+        self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 429)
+        self.now += 30
+        self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 200)
+
+    @override_settings(ADMIN_MIS_THROTTLE_RATES={'default': '10/min'})
+    def test_wait_of_costly_requests(self):
+        throttle = AdminCostThrottle()
+        self.assertTrue(throttle.allow_request(self.request(), self.view(cost=6)))
+        self.now += 30
+        self.assertTrue(throttle.allow_request(self.request(), self.view(cost=3)))
+        self.assertFalse(throttle.allow_request(self.request(), self.view(cost=2)))
+        # The first request leaves the window first and frees enough
+        self.assertEqual(throttle.wait(), 30)
+
+        # More than the whole budget passes once it is unused
+        self.now += 60
+        self.assertTrue(throttle.allow_request(self.request(), self.view(cost=50)))
+        self.assertFalse(throttle.allow_request(self.request(), self.view()))
+
+    @override_settings(ADMIN_MIS_THROTTLE_RATES={'default': '10/min'})
+    def test_concurrent_requests_share_the_budget(self):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(AdminCostThrottle().allow_request(self.request(), self.view()))
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 10)
+
+    @override_settings(ADMIN_MIS_CONCURRENCY_LIMIT=1)
+    def test_streamed_response_holds_its_slot(self):
+        response = self.client.get(self.url('export-data'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 429)
+
+        b''.join(response.streaming_content)
+        self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 200)
+
+    @override_settings(ADMIN_MIS_CONCURRENCY_LIMIT=1)
+    def test_uncaught_exception_releases_its_slot(self):
+        with mock.patch.object(AdminModelViewSet, 'get_changelist_data', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get(self.url('list-display-data'))
+
+        self.assertEqual(self.client.get(self.url('list-display-data')).status_code, 200)
+
+    @override_settings(ADMIN_MIS_THROTTLE_RATES={'default': '1/min'}, ADMIN_MIS_CONCURRENCY_LIMIT=1)
+    def test_exempt_requests(self):
+        for _ in range(3):
+            request = exempt_request(self.request())
+            self.assertTrue(AdminCostThrottle().allow_request(request, self.view()))
+            self.assertIsNone(acquire_concurrency_slot(request))
+
+        self.assertTrue(AdminCostThrottle().allow_request(self.request(), self.view()))
+        self.assertFalse(AdminCostThrottle().allow_request(self.request(), self.view()))
+
+
+class EventTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_client.force_login(self.superuser)
+        self.broker = events.InProcessBroker()
+        patcher = mock.patch.object(events, '_broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def events_url(self):
+        return reverse(
+            'admin_mis:async-model-events', kwargs={'app_name': 'auth', 'model_name': 'group'}
+        )
+
+    def test_replay(self):
+        first = self.broker.publish('auth', 'group', {'action': 'added'})
+        second = self.broker.publish('auth', 'group', {'action': 'changed'})
+        self.broker.publish('auth', 'user', {'action': 'added'})
+
+        self.assertTrue(first['id'].startswith(f'{self.broker.epoch}-'))
+        self.assertEqual(self.broker.replay('auth', 'group', first['id']), [second])
+        self.assertEqual(self.broker.replay('auth', 'group', second['id']), [])
+
+        # Ids of another process (or of this one before a restart)
+        other = events.InProcessBroker()
+        self.assertIsNone(other.replay('auth', 'group', first['id']))
+        self.assertIsNone(self.broker.replay('auth', 'group', '1'))
+
+    def test_replay_after_dropped_events(self):
+        with mock.patch.object(events, 'REPLAY_SIZE', 2):
+            self.broker = events.InProcessBroker()
+            first, second, third, fourth = [
+                self.broker.publish('auth', 'group', {'action': 'changed'}) for _ in range(4)
+            ]
+
+        # The second event was dropped
+        self.assertIsNone(self.broker.replay('auth', 'group', first['id']))
+        self.assertEqual(self.broker.replay('auth', 'group', second['id']), [third, fourth])
+
+    def test_event_stream_refused_under_wsgi(self):
+        response = self.client.get(self.events_url(), HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 406)
+
+    async def test_long_poll(self):
+        event = self.broker.publish('auth', 'group', {'action': 'added'})
+
+        response = await self.async_client.get(self.events_url(), {'last_id': 'stale-1', 'timeout': 0})
+        self.assertEqual(response.json(), {'events': [], 'last_id': None, 'reset': True})
+
+        response = await self.async_client.get(self.events_url(), {'timeout': 0})
+        self.assertEqual(response.json(), {'events': [], 'last_id': None})
+
+        last_id = f'{self.broker.epoch}-0'
+        response = await self.async_client.get(self.events_url(), {'last_id': last_id, 'timeout': 0})
+        self.assertEqual(response.json()['events'], [event])
+        self.assertEqual(response.json()['last_id'], event['id'])
+
+
+class ValidatorDescriptionTests(SimpleTestCase):
+    def test_builtin_validators(self):
+        self.assertEqual(
+            describe_validator(RegexValidator(r'^\d+$', message='Digits only.')),
+            {'message': 'Digits only.', 'code': 'invalid', 'regex': r'^\d+$'}
+        )
+        description = describe_validator(MinValueValidator(lambda: 5))
+        self.assertEqual(description['limit_value'], 5)
+
+    def test_instances_with_different_attributes(self):
+        class SizeValidator:
+            def __init__(self, max_size=None):
+                if max_size is not None:
+                    self.max_size = max_size
+
+            def __call__(self, value):
+                pass
+
+        self.assertEqual(describe_validator(SizeValidator()), {})
+        self.assertEqual(describe_validator(SizeValidator(10)), {'max_size': 10})
+        self.assertEqual(describe_validator(SizeValidator()), {})
+
+    def test_function_validators(self):
+        def validate_even(value):
+            pass
+
+        def validate_odd(value):
+            pass
+        validate_odd.message = 'Odd values only.'
+
+        self.assertEqual(describe_validator(validate_even), {})
+        self.assertEqual(describe_validator(validate_odd), {'message': 'Odd values only.'})
+
+
+def jpeg_segment(marker, payload):
+    return bytes([0xFF, marker]) + struct.pack('>H', len(payload) + 2) + payload
+
+def jpeg(sof_marker, width, height, app_size=14):
+    frame = b'\x08' + struct.pack('>HH', height, width) + b'\x03' + b'\x01\x22\x00' * 3
+    return (
+        b'\xff\xd8'
+        + jpeg_segment(0xE0, b'JFIF\x00' + b'\x00' * (app_size - 5))
+        + jpeg_segment(sof_marker, frame)
+        + b'\xff\xd9'
+    )
+
+def webp(chunk, payload):
+    data = chunk + struct.pack('<I', len(payload)) + payload
+    return b'RIFF' + struct.pack('<I', len(data) + 4) + b'WEBP' + data
+
+
+class ImageHeaderTests(SimpleTestCase):
+    """
+    Dimensions read from hand-built image headers.
+    """
+    def dimensions(self, data):
+        file = io.BytesIO(data)
+        file.seek(3)
+        dimensions = read_image_dimensions(file)
+        # The stream is left where it was
+        self.assertEqual(file.tell(), 3)
+        return dimensions
+
+    def test_png(self):
+        data = (
+            b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR'
+            + struct.pack('>II', 640, 480) + b'\x08\x02\x00\x00\x00' + b'\x00' * 4
+        )
+        self.assertEqual(self.dimensions(data), (640, 480))
+
+    def test_gif(self):
+        for signature in (b'GIF87a', b'GIF89a'):
+            data = signature + struct.pack('<HH', 320, 200) + b'\x00' * 20
+            self.assertEqual(self.dimensions(data), (320, 200))
+
+    def test_jpeg(self):
+        # Baseline and progressive frames, after an APP0 segment
+        self.assertEqual(self.dimensions(jpeg(0xC0, 1024, 768)), (1024, 768))
+        self.assertEqual(self.dimensions(jpeg(0xC2, 800, 600)), (800, 600))
+        # Fill bytes before a marker
+        data = jpeg(0xC0, 10, 20).replace(b'\xff\xc0', b'\xff\xff\xff\xc0')
+        self.assertEqual(self.dimensions(data), (10, 20))
+
+    def test_jpeg_large_segments_are_skipped(self):
+        # Segments are seeked over, they do not count towards MAX_HEADER_BYTES
+        data = jpeg(0xC0, 1024, 768)
+        app1 = jpeg_segment(0xE1, b'\x00' * 65000)
+        data = data[:2] + app1 * (MAX_HEADER_BYTES // len(app1) + 1) + data[2:]
+        self.assertEqual(self.dimensions(data), (1024, 768))
+
+    def test_webp(self):
+        vp8 = b'\x00\x00\x00' + b'\x9d\x01\x2a' + struct.pack('<HH', 400, 300)
+        self.assertEqual(self.dimensions(webp(b'VP8 ', vp8)), (400, 300))
+
+        bits = (400 - 1) | (300 - 1) << 14
+        vp8l = b'\x2f' + struct.pack('<I', bits)
+        self.assertEqual(self.dimensions(webp(b'VP8L', vp8l)), (400, 300))
+
+        vp8x = b'\x00' * 4 + (4000 - 1).to_bytes(3, 'little') + (3000 - 1).to_bytes(3, 'little')
+        self.assertEqual(self.dimensions(webp(b'VP8X', vp8x)), (4000, 3000))
+
+    def test_truncated_and_garbage(self):
+        png = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + b'\x00\x00'
+        samples = [
+            b'',
+            b'not an image at all',
+            png,
+            b'GIF89a\x01',
+            jpeg(0xC0, 1024, 768)[:25],
+            b'\xff\xd8' + b'\x00' * 100,
+            webp(b'VP8 ', b'\x00' * 10),
+            webp(b'VP8L', b'\x00' * 5),
+        ]
+        for data in samples:
+            with self.subTest(data=data[:12]):
+                self.assertIsNone(self.dimensions(data))
+
+    def test_not_a_file(self):
+        self.assertIsNone(read_image_dimensions(b'\x89PNG'))
+
+
+class FieldSelectionTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.group = Group.objects.create(name='group')
+
+    def get(self, **params):
+        return self.client.get(self.url('retrieve-data', pk=self.group.pk), params)
+
+    def test_fields_and_exclude(self):
+        response = self.get(fields='name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'group')
+        self.assertNotIn('permissions', response.json())
+
+        response = self.get(exclude='permissions')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('permissions', response.json())
+
+    def test_unknown_names(self):
+        for params in ({'fields': 'name,missing'}, {'exclude': 'permissions,missing'}):
+            with self.subTest(params=params):
+                response = self.get(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('missing', response.json()['message'])
+
+
+class BootstrapTests(AdminAPITestCase):
+    def test_filters_match_filters_endpoint(self):
+        User.objects.create(username='user')
+        params = {'is_staff__exact': '1'}
+
+        response = self.client.get(self.url('bootstrap-data', model_name='user'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['list']['count'], 1)
+
+        filters = self.client.get(self.url('list-filter-data', model_name='user'), params)
+        self.assertEqual(response.json()['filters'], filters.json())
+        # The choices describe the unfiltered list
+        choices = filters.json()['filters'][0]['choices']
+        self.assertTrue(choices[0]['selected'])
+
+    @override_settings(
+        ADMIN_MIS_CACHE='admin_mis_tests',
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'admin_mis_tests': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'admin-mis-bootstrap-tests',
+            },
+        },
+    )
+    def test_filters_are_shared_through_the_cache(self):
+        caches['admin_mis_tests'].clear()
+        with mock.patch.object(
+            AdminModelViewSet, 'get_filters_data', autospec=True, return_value={'filters': []}
+        ) as get_filters_data:
+            self.client.get(self.url('list-filter-data'))
+            response = self.client.get(self.url('bootstrap-data'))
+
+        self.assertEqual(response.json()['filters'], {'filters': []})
+        self.assertEqual(get_filters_data.call_count, 1)
+
+
+@override_settings(
+    ADMIN_MIS_INSTRUMENTATION=True,
+    MIDDLEWARE=['django_admin_mis.instrumentation.InstrumentationMiddleware', *settings.MIDDLEWARE],
+)
+class InstrumentationTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_client.force_login(self.superuser)
+
+    def query_count(self, response):
+        # db;dur=1.23;desc="4 queries"
+        timing = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+        return int(timing['db'].split('"')[1].split()[0])
+
+    def test_sync_request(self):
+        response = self.client.get(self.url('list-display-data'))
+        self.assertGreater(self.query_count(response), 0)
+
+    async def test_async_request(self):
+        url = reverse(
+            'admin_mis:async-list-display-data', kwargs={'app_name': 'auth', 'model_name': 'group'}
+        )
+        response = await self.async_client.get(url)
+        self.assertGreater(self.query_count(response), 0)
+
+        # Sync views served through ASGI
+        response = await self.async_client.get(self.url('list-display-data'))
+        self.assertGreater(self.query_count(response), 0)
+
+
+class LookupTests(AdminAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.groups = Group.objects.bulk_create([Group(name=f'group {i:03}') for i in range(120)])
+        self.groups.sort(key=lambda group: group.pk)
+
+    def get(self, **params):
+        response = self.client.get(self.url('lookup-data', model_name='user', field_name='groups'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_keyset_pages(self):
+        page = self.get(limit=50)
+        self.assertEqual([choice['id'] for choice in page['results']], [g.pk for g in self.groups[:50]])
+        self.assertEqual(page['cursor'], self.groups[49].pk)
+        self.assertTrue(page['has_more'])
+
+        page = self.get(limit=50, after=page['cursor'])
+        self.assertEqual(page['results'][0], {'id': self.groups[50].pk, 'display': 'group 050'})
+
+        page = self.get(limit=50, after=self.groups[99].pk)
+        self.assertEqual(len(page['results']), 20)
+        self.assertFalse(page['has_more'])
+
+    def test_limit_is_capped(self):
+        self.assertEqual(len(self.get(limit=1000)['results']), 100)
+        self.assertEqual(len(self.get(limit=0)['results']), 1)
+
+    def test_search(self):
+        page = self.get(q='11')
+        self.assertEqual(
+            [choice['display'] for choice in page['results']],
+            ['group 011', *[f'group 11{i}' for i in range(10)]]
+        )
+
+    def test_limit_choices_to(self):
+        field = User._meta.get_field('groups')
+        with mock.patch.object(field.remote_field, 'limit_choices_to', {'name__endswith': '7'}):
+            page = self.get(limit=100)
+        self.assertEqual(len(page['results']), 12)
+        self.assertTrue(all(choice['display'].endswith('7') for choice in page['results']))
+
+    def test_to_field_name(self):
+        def formfield_for_manytomany(db_field, request, **kwargs):
+            return ModelMultipleChoiceField(Group.objects.order_by('-name'), to_field_name='name')
+
+        user_admin = admin.site._registry[User]
+        with mock.patch.object(user_admin, 'formfield_for_manytomany', formfield_for_manytomany):
+            page = self.get(limit=2, after=self.groups[0].pk)
+
+        # Values of the to_field, paged on the primary key
+        self.assertEqual([choice['id'] for choice in page['results']], ['group 001', 'group 002'])
+        self.assertEqual(page['cursor'], self.groups[2].pk)
+
+
+class FieldTypeNameTests(SimpleTestCase):
+    def test_type_names(self):
+        cases = [
+            (models.CharField(max_length=10), 'string'),
+            (models.DateField(), 'date'),
+            (models.DateTimeField(), 'date time'),
+            (ArrayField(models.IntegerField()), 'array of integer'),
+            (ArrayField(models.DateField()), 'array of date'),
+            # Wording of earlier releases, kept for clients matching on it
+            (ArrayField(models.DateTimeField()), 'array of date'),
+        ]
+        for field, expected in cases:
+            with self.subTest(field=field.__class__.__name__):
+                self.assertEqual(format_field_name(field), expected)
@@ -0,0 +1,239 @@
+import math
+import threading
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import KEY_PREFIX, get_cache
+
+# Cost of one request of an action, before scaling by its selection size
+DEFAULT_COSTS = {
+    'list_display_data': 1,
+    'export_data': 20,
+    'summary_of_delete_objects': 2,
+    'delete_objects': 2,
+    'action_perform': 2,
+}
+
+# Selected rows (ids or page size) counting as one more unit of cost
+ROWS_PER_COST = 100
+
+# Slices of a rate's duration, each with its own cost counter in the cache
+WINDOW_BUCKETS = 10
+
+# Seconds a cache-backed concurrency counter outlives a request, in case its worker dies
+CONCURRENCY_TIMEOUT = 300
+
+def get_throttle_rates():
+    """
+    Return ADMIN_MIS_THROTTLE_RATES: DRF rates ('1000/min') per action name,
+    'default' applying to the actions without their own rate.
+    """
+    return getattr(settings, 'ADMIN_MIS_THROTTLE_RATES', {})
+
+def exempt_request(request):
+    """
+    Exempt an internal request (e.g. of the warm-up) from the rate and
+    concurrency limits of its user.
+    """
+    request._admin_mis_exempt = True
+    return request
+
+def is_exempt(request):
+    # Set on the HttpRequest, DRF requests proxy the attribute
+    return getattr(request, '_admin_mis_exempt', False)
+
+def get_throttle_cost(action, rows=0):
+    """
+    Cost of a request of ``action`` selecting ``rows`` rows, at least 1.
+    """
+    costs = {**DEFAULT_COSTS, **getattr(settings, 'ADMIN_MIS_THROTTLE_COSTS', {})}
+    return costs.get(action, 1) * max(1, math.ceil(rows / ROWS_PER_COST))
+
+
+class AdminCostThrottle(SimpleRateThrottle):
+    """
+    Rate throttle of the admin viewset where each request weighs its cost.
+
+    The cost comes from the view's ``get_throttle_cost``: expensive actions
+    and large selections use up more of the user's budget. Actions with their
+    own rate in ADMIN_MIS_THROTTLE_RATES have their own budget, the others
+    share the 'default' one. Without a matching rate, requests are not throttled.
+
+    The window is cut in WINDOW_BUCKETS slices counted with cache.add/incr.
+    A request adds its cost to the current slice before checking the sum of
+    the window, and takes it back when refused, so concurrent requests of a
+    user cannot both spend the same remaining budget.
+    """
+    scope = 'admin_mis'
+
+    def __init__(self):
+        # The rate depends on the action, it is read in allow_request
+        pass
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        bucket = view.action if view.action in get_throttle_rates() else 'default'
+        return f'{KEY_PREFIX}:throttle:{bucket}:{ident}'
+
+    def allow_request(self, request, view):
+        rates = get_throttle_rates()
+        rate = rates.get(view.action, rates.get('default'))
+        if rate is None or is_exempt(request):
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(rate)
+        self.key = self.get_cache_key(request, view)
+        self.cache = get_cache() or default_cache
+        self.now = self.timer()
+        self.bucket_duration = self.duration / WINDOW_BUCKETS
+
+        # A request costing more than the whole budget passes once the budget is unused
+        self.cost = min(view.get_throttle_cost(request), self.num_requests)
+
+        current = int(self.now // self.bucket_duration)
+        buckets = range(current - WINDOW_BUCKETS + 1, current + 1)
+        self.add_cost(current, self.cost)
+
+        # Oldest first, as (bucket, cost) pairs, this request included
+        costs = self.cache.get_many([self.get_bucket_key(bucket) for bucket in buckets])
+        self.history = [(bucket, costs.get(self.get_bucket_key(bucket), 0)) for bucket in buckets]
+
+        if sum(cost for _, cost in self.history) > self.num_requests:
+            self.add_cost(current, -self.cost)
+            return self.throttle_failure()
+        return True
+
+    def get_bucket_key(self, bucket):
+        return f'{self.key}:{bucket}'
+
+    def add_cost(self, bucket, cost):
+        key = self.get_bucket_key(bucket)
+        # The slice is read until it leaves the window
+        timeout = math.ceil(self.duration + self.bucket_duration)
+        self.cache.add(key, 0, timeout)
+        try:
+            self.cache.incr(key, cost)
+        except ValueError:
+            # Expired between add and incr
+            self.cache.add(key, max(cost, 0), timeout)
+
+    def wait(self):
+        # Seconds until enough of the oldest slices leave the window
+        excess = sum(cost for _, cost in self.history) - self.num_requests
+        for bucket, cost in self.history:
+            excess -= cost
+            if excess <= 0:
+                return max((bucket + WINDOW_BUCKETS) * self.bucket_duration - self.now, 0)
+        return None
+
+
+class LocalConcurrencyBackend:
+    """
+    Counts the in-flight requests of each user within the current process.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def acquire(self, key, limit):
+        with self.lock:
+            count = self.counts.get(key, 0)
+            if count >= limit:
+                return False
+            self.counts[key] = count + 1
+            return True
+
+    def release(self, key):
+        with self.lock:
+            count = self.counts.get(key, 0) - 1
+            if count > 0:
+                self.counts[key] = count
+            else:
+                self.counts.pop(key, None)
+
+
+class CacheConcurrencyBackend:
+    """
+    Counts the in-flight requests of each user in the shared cache, across workers.
+
+    The counters expire CONCURRENCY_TIMEOUT seconds after their last
+    request starts, so slots held by a killed worker are eventually freed.
+    """
+    def __init__(self, cache):
+        self.cache = cache
+
+    def acquire(self, key, limit):
+        self.cache.add(key, 0, CONCURRENCY_TIMEOUT)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            self.cache.add(key, 1, CONCURRENCY_TIMEOUT)
+            count = 1
+
+        if count > limit:
+            self.release(key)
+            return False
+        self.cache.touch(key, CONCURRENCY_TIMEOUT)
+        return True
+
+    def release(self, key):
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+
+class ConcurrencySlot:
+    def __init__(self, backend, key):
+        self.backend = backend
+        self.key = key
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.backend.release(self.key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_concurrency_backend():
+    """
+    Return the backend set by ADMIN_MIS_CONCURRENCY_BACKEND: 'local' (default)
+    or 'cache', which uses ADMIN_MIS_CACHE.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                cache = get_cache()
+                if getattr(settings, 'ADMIN_MIS_CONCURRENCY_BACKEND', 'local') == 'cache' and cache is not None:
+                    _backend = CacheConcurrencyBackend(cache)
+                else:
+                    _backend = LocalConcurrencyBackend()
+    return _backend
+
+def acquire_concurrency_slot(request):
+    """
+    Take one of the ADMIN_MIS_CONCURRENCY_LIMIT request slots of the user.
+
+    Returns the slot to release once the response is sent, None when no limit
+    applies, or False when the user has no slot left.
+    """
+    limit = getattr(settings, 'ADMIN_MIS_CONCURRENCY_LIMIT', None)
+    if not limit or is_exempt(request) or not (request.user and request.user.is_authenticated):
+        return None
+
+    backend = get_concurrency_backend()
+    key = f'{KEY_PREFIX}:concurrency:{request.user.pk}'
+    if not backend.acquire(key, limit):
+        return False
+    return ConcurrencySlot(backend, key)
@@ -1,13 +1,25 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework import routers
+from .async_views import (AsyncFieldMetaView, AsyncListDisplayView,
+                          AsyncRetrieveView, ModelEventsView)
+from .metrics import metrics_view
 from .views import AdminModelViewSet
 
 router = routers.DefaultRouter()
 
 router.register('admin', AdminModelViewSet, 'admin')
 
+# Native async variants of the read endpoints, for deployments served through ASGI
+async_urlpatterns = [
+    re_path(r'^(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/$', AsyncListDisplayView.as_view(), name='async-list-display-data'),
+    re_path(r'^(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/fields/$', AsyncFieldMetaView.as_view(), name='async-list-field-meta'),
+    re_path(r'^(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/events/$', ModelEventsView.as_view(), name='async-model-events'),
+    re_path(r'^(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)/$', AsyncRetrieveView.as_view(), name='async-retrieve-data'),
+]
+
 app_name = 'admin_mis'
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/admin/', include(async_urlpatterns)),
+    path('metrics', metrics_view, name='metrics'),
 ]
-
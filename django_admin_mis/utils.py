@@ -1,23 +1,112 @@
 import json
+import logging
 import re
+import time
+
+from django.apps import apps
+from django.conf import settings
 from django.contrib import messages
+from django.core.exceptions import FieldDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.functional import Promise
+from django.utils.translation import get_language
 
-def format_field_name(field):
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+def is_asgi_request(request):
+    # DRF requests wrap the Django request
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+def normalize_field_description(description):
     """
-    Format a field's name for display.
+    Turn a field description such as "String (up to %(max_length)s)" into a type name.
     """
-    field_name = field.description.lower()
+    field_name = description.lower()
     field_name = re.sub(r'\([^)^(]*\)', '', field_name)
     field_name = re.sub(r'\([^)^(]*\)', '', field_name)
     field_name = re.sub(r'\s+', ' ', field_name).strip()
+    return field_name
+
+def get_geometry_type(field):
+    return field.geom_type.lower()
+
+# Field type names keyed by the dotted path of the field class. Paths keep
+# optional contrib apps (gis, postgres) from being imported just to build this table.
+# Values are either a type name or a function computing it from the field.
+# ArrayField is left to its per-instance description ("array of date" for
+# dates with or without time), the wording clients already match on.
+FIELD_TYPE_REGISTRY = {
+    'django.db.models.fields.DateTimeField': 'date time',
+    'django.contrib.gis.db.models.fields.GeometryField': get_geometry_type,
+}
+
+# Resolved registry entries, one per field class
+_field_type_cache = {}
+
+def register_field_type(field_class, field_type):
+    """
+    Register the type name reported for ``field_class`` and its subclasses.
     
-    if field.get_internal_type() == 'DateTimeField':
-        field_name += ' time'
+    ``field_class`` may be a class or its dotted path and ``field_type`` either
+    a string or a function called with the field instance.
+    """
+    if not isinstance(field_class, str):
+        field_class = f'{field_class.__module__}.{field_class.__qualname__}'
         
-    if field.get_internal_type() == 'GeometryField':
-        field_name = field.geom_type.lower()
+    FIELD_TYPE_REGISTRY[field_class] = field_type
+    _field_type_cache.clear()
+
+def resolve_field_type(field_class):
+    """
+    Resolve the type name of a field class by walking its MRO.
     
-    return field_name
+    The first class that is either registered or defines its own ``description``
+    wins. The result is a string, a function of the field, or None when the
+    description is computed per instance.
+    """
+    # Descriptions are translatable, so resolve them per active language
+    key = (field_class, get_language())
+    try:
+        field_type = _field_type_cache[key]
+    except KeyError:
+        record_cache('field_type', False)
+    else:
+        record_cache('field_type', True)
+        return field_type
+    
+    field_type = None
+    for klass in field_class.__mro__:
+        path = f'{klass.__module__}.{klass.__qualname__}'
+        
+        if path in FIELD_TYPE_REGISTRY:
+            field_type = FIELD_TYPE_REGISTRY[path]
+            break
+        
+        description = klass.__dict__.get('description')
+        if description is not None:
+            if isinstance(description, (str, Promise)):
+                field_type = normalize_field_description(str(description))
+            break
+    
+    _field_type_cache[key] = field_type
+    return field_type
+
+def format_field_name(field):
+    """
+    Format a field's name for display.
+    """
+    field_type = resolve_field_type(type(field))
+    
+    if field_type is None:
+        # The description is a property depending on the instance
+        return normalize_field_description(str(field.description))
+    
+    if callable(field_type):
+        return field_type(field)
+    
+    return field_type
 
 def format_message_level(level):
     """
@@ -34,55 +123,119 @@ def format_message_level(level):
     else:
         return "Unknown"
     
+# Validator attributes copied into the field schema, in output order.
+# Each entry maps the attribute name to a function formatting its value.
+VALIDATOR_ATTRIBUTES = (
+    ('message', None),
+    ('messages', None),
+    ('code', None),
+    ('limit_value', None),
+    ('max_digits', None),
+    ('decimal_places', None),
+    ('regex', lambda regex: str(regex.pattern)),
+    ('size', None),
+    ('min_size', None),
+    ('allowed_extensions', None),
+    ('max_size', None),
+)
+
+# Compiled description extractors, keyed by validator class and the names of
+# the VALIDATOR_ATTRIBUTES present: instances of a class (and functions) may differ
+_validator_extractors = {}
+
+def _compile_validator_extractor(names):
+    """
+    Build a function describing validators having the attributes ``names``.
+    
+    The attributes to read and their formatters are resolved once, so later
+    calls only read the attributes that are known to exist.
+    """
+    attributes = tuple(
+        (name, formatter) for name, formatter in VALIDATOR_ATTRIBUTES
+        if name in names
+    )
+    
+    def extract(validator):
+        validator_info = {}
+        
+        for name, formatter in attributes:
+            value = getattr(validator, name)
+            validator_info[name] = formatter(value) if formatter else value
+            
+        return validator_info
+    
+    return extract
+
+def get_validator_extractor(validator):
+    """
+    Return the cached description extractor for the validator's class and attributes.
+    """
+    names = tuple(name for name, _ in VALIDATOR_ATTRIBUTES if hasattr(validator, name))
+    key = (type(validator), names)
+    extractor = _validator_extractors.get(key)
+    
+    if extractor is None:
+        extractor = _compile_validator_extractor(names)
+        _validator_extractors[key] = extractor
+        
+    return extractor
+
+def get_limit_value(validator):
+    """
+    Evaluate a callable ``limit_value``, caching the result for a short time.
+    
+    Limits such as ``min_year`` are relative to the current date, so they are
+    recomputed once ``ADMIN_MIS_VALIDATOR_LIMIT_TTL`` seconds have passed.
+    """
+    now = time.monotonic()
+    cached = getattr(validator, '_limit_value_cache', None)
+    if cached is not None and cached[0] > now:
+        record_cache('validator_limit', True)
+        return cached[1]
+    
+    record_cache('validator_limit', False)
+    value = validator.limit_value()
+    ttl = getattr(settings, 'ADMIN_MIS_VALIDATOR_LIMIT_TTL', 60)
+    
+    try:
+        validator._limit_value_cache = (now + ttl, value)
+    except AttributeError:
+        pass
+    
+    return value
+
+def describe_validator(validator):
+    """
+    Describe a single validator, reusing the static part of previous descriptions.
+    """
+    description = getattr(validator, '_description_cache', None)
+    record_cache('validator_description', description is not None)
+    
+    if description is None:
+        description = get_validator_extractor(validator)(validator)
+        
+        try:
+            validator._description_cache = description
+        except AttributeError:
+            pass
+    
+    description = dict(description)
+    if 'limit_value' in description and callable(description['limit_value']):
+        description['limit_value'] = get_limit_value(validator)
+        
+    return description
+
 def get_validator_info(field):
     """
     Extract information about validators applied to a field and return as a list of dictionaries.
     """
     validators_info = []
-    try:
-        for validator in field.validators:
-            validator_info = {}
-            
-            if hasattr(validator, 'message'):
-                validator_info['message'] = validator.message
-                
-            if hasattr(validator, 'messages'):
-                validator_info['messages'] = validator.messages
-                
-            if hasattr(validator, 'code'):
-                validator_info['code'] = validator.code
-            
-            if hasattr(validator, 'limit_value'):
-                if callable(validator.limit_value):
-                    validator_info['limit_value'] = validator.limit_value()
-                else:
-                    validator_info['limit_value'] = validator.limit_value
-                
-            if hasattr(validator, 'max_digits'):
-                validator_info['max_digits'] = validator.max_digits
-                
-            if hasattr(validator, 'decimal_places'):
-                validator_info['decimal_places'] = validator.decimal_places
-                
-            if hasattr(validator, 'regex'):
-                validator_info['regex'] = str(validator.regex.pattern)
-                
-            if hasattr(validator, 'size'):
-                validator_info['size'] = validator.size
-                
-            if hasattr(validator, 'min_size'):
-                validator_info['min_size'] = validator.min_size
-                
-            if hasattr(validator, 'allowed_extensions'):
-                validator_info['allowed_extensions'] = validator.allowed_extensions
-                
-            if hasattr(validator, 'max_size'):
-                validator_info['max_size'] = validator.max_size
-            
-            validators_info.append(validator_info)
-            
-    except Exception as e:
-        print(e)
+    
+    for validator in field.validators:
+        try:
+            validators_info.append(describe_validator(validator))
+        except Exception:
+            logger.exception('Unable to describe validator %r of %r', validator, field)
         
     return validators_info
 
@@ -96,9 +249,64 @@ def get_default_value(field):
         try:
             json.dumps(default_value)
         except Exception as e:
-            print(f'Error due to {e} in default')
+            logger.warning('Default value of %r is not JSON serializable: %s', field, e)
             default_value = None
     else:
         default_value = None
         
     return default_value
+
+def has_dynamic_meta(field):
+    """
+    Whether the metadata of a field changes over time: a callable default
+    or a validator with a callable ``limit_value``.
+    """
+    fields = [field]
+    if hasattr(field, 'base_field'):
+        fields.append(field.base_field)
+    
+    for field in fields:
+        if field.has_default() and callable(field.default):
+            return True
+        if any(callable(getattr(validator, 'limit_value', None)) for validator in field.validators):
+            return True
+        
+    return False
+
+def refresh_dynamic_meta(data, model):
+    """
+    Describe again the callable defaults and validator limits in field metadata
+    built by get_model_fields_data (e.g. read from a cache), inlines included.
+    """
+    fields = []
+    for field_data in data.get('fields', ()):
+        try:
+            field = model._meta.get_field(field_data['name'])
+        except FieldDoesNotExist:
+            fields.append(field_data)
+            continue
+        
+        if field.is_relation or not has_dynamic_meta(field):
+            fields.append(field_data)
+            continue
+        
+        field_data = {
+            **field_data,
+            'validators': get_validator_info(field),
+            'defaults': get_default_value(field),
+        }
+        if 'base_data' in field_data:
+            field_data['base_data'] = {
+                **field_data['base_data'],
+                'validators': get_validator_info(field.base_field),
+                'defaults': get_default_value(field.base_field),
+            }
+        fields.append(field_data)
+    
+    data = {**data, 'fields': fields}
+    if data.get('inlines'):
+        data['inlines'] = [
+            refresh_dynamic_meta(inline, apps.get_model(inline['app_name'], inline['model_name']))
+            for inline in data['inlines']
+        ]
+    return data
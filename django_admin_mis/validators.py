@@ -1,7 +1,174 @@
 import os
+import struct
+
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
 
+from .metrics import record_cache
+
+# Upper bound of bytes read while looking for image dimensions. Skipped
+# segments (EXIF, ICC profiles, ...) are seeked over and do not count.
+MAX_HEADER_BYTES = 64 * 1024
+
+# JPEG start-of-frame markers that carry the image dimensions
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+
+class _HeaderReader:
+    """
+    Read from a file object while keeping count of the consumed bytes.
+    """
+    def __init__(self, file, limit=MAX_HEADER_BYTES):
+        self.file = file
+        self.limit = limit
+        self.consumed = 0
+
+    def read(self, size):
+        if self.consumed + size > self.limit:
+            return b''
+        data = self.file.read(size)
+        self.consumed += len(data)
+        return data
+
+    def skip(self, size):
+        try:
+            self.file.seek(size, os.SEEK_CUR)
+        except (AttributeError, OSError, ValueError):
+            # Non seekable streams have to be read through
+            return len(self.read(size)) == size
+        return True
+
+
+def _jpeg_dimensions(reader):
+    while True:
+        byte = reader.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+
+        # Markers may be padded with any number of 0xFF fill bytes
+        marker = reader.read(1)
+        while marker == b'\xff':
+            marker = reader.read(1)
+        if not marker:
+            return None
+
+        marker = marker[0]
+        if marker == 0xD8 or marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            continue
+
+        length = reader.read(2)
+        if len(length) != 2:
+            return None
+        length = struct.unpack('>H', length)[0]
+
+        if marker in JPEG_SOF_MARKERS:
+            frame = reader.read(5)
+            if len(frame) != 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+
+        if not reader.skip(length - 2):
+            return None
+
+
+def _webp_dimensions(head):
+    chunk = head[12:16]
+    if chunk == b'VP8X' and len(head) >= 30:
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return width, height
+
+    if chunk == b'VP8 ' and len(head) >= 30 and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+
+    if chunk == b'VP8L' and len(head) >= 25 and head[20] == 0x2F:
+        b0, b1, b2, b3 = head[21:25]
+        width = 1 + (b0 | (b1 & 0x3F) << 8)
+        height = 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0F) << 10)
+        return width, height
+
+    return None
+
+
+def read_image_dimensions(file):
+    """
+    Read the (width, height) of a PNG, JPEG, GIF or WebP image from its header.
+
+    Only the first bytes of the stream are read and the image is never decoded.
+    Returns None when the format is not recognised, so callers can fall back to Pillow.
+    """
+    try:
+        position = file.tell()
+        file.seek(0)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    try:
+        reader = _HeaderReader(file)
+        head = reader.read(30)
+
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return _webp_dimensions(head)
+
+        if head[:2] == b'\xff\xd8':
+            file.seek(2)
+            reader.consumed = 2
+            return _jpeg_dimensions(reader)
+
+        return None
+    except (OSError, ValueError, struct.error):
+        return None
+    finally:
+        file.seek(position)
+
+
+def get_image_dimensions(value):
+    """
+    Return the (width, height) of an uploaded or stored image.
+
+    The result is cached on the file object using the same attribute as
+    Django's ImageFile, so later ``value.width``/``value.height`` lookups reuse it.
+    """
+    dimensions = getattr(value, '_dimensions_cache', None)
+    if dimensions is not None:
+        record_cache('image_dimensions', True)
+        return dimensions
+
+    file = getattr(value, 'file', None) or value
+    dimensions = getattr(file, '_dimensions_cache', None)
+    record_cache('image_dimensions', dimensions is not None)
+
+    if dimensions is None:
+        dimensions = read_image_dimensions(file)
+
+    if dimensions is None:
+        # Unknown format, let Pillow work it out
+        width = value.image.width if hasattr(value, 'image') else value.width
+        height = value.image.height if hasattr(value, 'image') else value.height
+        dimensions = (width, height)
+
+    dimensions = tuple(dimensions)
+    for obj in (value, file):
+        try:
+            obj._dimensions_cache = dimensions
+        except AttributeError:
+            pass
+
+    return dimensions
+
 @deconstructible
 class ImageValidator:
     messages = {
@@ -53,8 +220,10 @@ class ImageValidator:
                 }
             )
 
-        width = value.image.width if hasattr(value, 'image') else value.width
-        height = value.image.height if hasattr(value, 'image') else value.height
+        if self.min_size is None and self.max_size is None:
+            return
+
+        width, height = get_image_dimensions(value)
 
         if self.min_size is not None and (width < self.min_size[0] or height < self.min_size[1]):
             raise ValidationError(
@@ -1,33 +1,175 @@
 
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from functools import partial
+
 from django.apps import apps
+from django.conf import settings
 from django.contrib import admin, messages
 from django.contrib.admin import ModelAdmin, helpers
-from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.models import ADDITION, CHANGE, DELETION, LogEntry
+from django.contrib.admin.options import (InlineModelAdmin,
+                                          get_content_type_for_model)
 from django.contrib.admin.utils import flatten_fieldsets, get_deleted_objects
-from django.db import transaction
-from django.db.models import Q
+from django.contrib.admin.views.main import ALL_VAR
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models, transaction
+from django.db.models import Max, Q
 from django.forms.formsets import all_valid
+from django.http import QueryDict
 from django.urls import reverse
+from django.utils.translation import get_language
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import ParseError, PermissionDenied
+from rest_framework.exceptions import ParseError, PermissionDenied, Throttled
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from . import metrics
+from .cache import (get_cache, get_cached_count, get_or_compute,
+                    get_user_key)
+from .changelist import (get_changelist_instance, get_column_plan,
+                         load_changelist_results)
+from .instrumentation import attach_query_report, get_current_trace, timed
+from .metrics import record_cache
 from .permissions import CustomStaffPermission
+from .renderers import get_renderer_classes
 from .serializers import (ActionSerializer, AdminMenuSerializer,
                           DynamicSerializer)
+from .throttling import (AdminCostThrottle, acquire_concurrency_slot,
+                         get_throttle_cost)
 from .utils import (format_field_name, format_message_level, get_default_value,
-                    get_validator_info)
+                    get_validator_info, has_dynamic_meta, is_asgi_request,
+                    refresh_dynamic_meta)
+
+logger = logging.getLogger(__name__)
+
+# Default and maximum number of rows fetched per round-trip by export_data
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_MAX_CHUNK_SIZE = 10000
+
+# Layouts of list_display_data rows, see AdminModelViewSet.get_layout
+LIST_LAYOUTS = ('records', 'rows', 'columnar')
+
+# Default and maximum number of log entries read per list_changes_data call
+CHANGES_LIMIT = 500
+CHANGES_MAX_LIMIT = 2000
+
+# Change feed action names of the LogEntry action flags
+CHANGE_ACTIONS = {ADDITION: 'added', CHANGE: 'changed', DELETION: 'deleted'}
+
+# Seconds of log entries before the cursor read again by list_changes_data,
+# for transactions committing after entries with higher ids
+CHANGES_OVERLAP = 60
+
+# Default and maximum number of choices returned per lookup_data call
+LOOKUP_LIMIT = 20
+LOOKUP_MAX_LIMIT = 100
+
+# Inline schemas compiled by AdminModelViewSet.get_inline_schema, least recently used first
+_inline_schema_cache = OrderedDict()
+_inline_schema_lock = threading.Lock()
+
+# Number of inline schemas kept per process
+INLINE_SCHEMA_CACHE_SIZE = 256
 
 
 # Create your views here.
 class AdminModelViewSet(viewsets.ViewSet,
                         viewsets.GenericViewSet): 
     permission_classes = [CustomStaffPermission, ]
+    throttle_classes = [*api_settings.DEFAULT_THROTTLE_CLASSES, AdminCostThrottle]
+    renderer_classes = get_renderer_classes()
     serializer_class = AdminMenuSerializer
     filter_backends = []
     
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            if not metrics.is_enabled():
+                return super().dispatch(request, *args, **kwargs)
+            
+            with metrics.RequestRecorder(self):
+                return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Uncaught exceptions skip finalize_response
+            self.release_concurrency_slot()
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        self.release_concurrency_slot(response)
+        
+        # Development aid, see ADMIN_MIS_QUERY_DEBUG
+        trace = get_current_trace()
+        if trace is not None and trace.debug:
+            resolved = getattr(self, '_model_register_admin', None)
+            attach_query_report(response, trace, resolved[1] if resolved else None)
+        
+        return response
+    
+    def record_rows(self, count):
+        # Rows serialized by this request, reported to the metrics registry
+        self.serialized_rows = getattr(self, 'serialized_rows', 0) + count
+    
+    @timed('permissions')
+    def initial(self, request, *args, **kwargs):
+        # Authentication, permission and throttle checks
+        super().initial(request, *args, **kwargs)
+        
+        # Per-user cap of in-flight requests, see ADMIN_MIS_CONCURRENCY_LIMIT
+        slot = acquire_concurrency_slot(request)
+        if slot is False:
+            raise Throttled(detail='Too many concurrent requests.')
+        self._concurrency_slot = slot
+    
+    def release_concurrency_slot(self, response=None):
+        slot, self._concurrency_slot = getattr(self, '_concurrency_slot', None), None
+        if slot is None:
+            return
+        
+        if response is not None and response.streaming:
+            # Held until the streamed body is sent
+            response._resource_closers.append(slot.release)
+        else:
+            slot.release()
+    
+    def get_throttle_rows(self, request):
+        """_summary_
+        The get_throttle_rows method estimates the rows a request works on:
+        the ids of 'pk' or 'item_ids' selections, the page size of lists
+        and bootstraps (list_max_show_all when all rows are asked for), or
+        list_max_show_all for exports, which run no COUNT query to know better.
+        """
+        if 'pk' in self.kwargs:
+            return len(self.kwargs['pk'].split(','))
+        
+        if self.action == 'action_perform':
+            item_ids = request.data.get('item_ids') or ''
+            return len(str(item_ids).split(','))
+        
+        if self.action == 'export_data':
+            _, register_app = self.get_model_register_admin()
+            return register_app.list_max_show_all
+        
+        if self.action in ('list_display_data', 'bootstrap_data'):
+            _, register_app = self.get_model_register_admin()
+            if ALL_VAR in request.query_params:
+                return register_app.list_max_show_all
+            return register_app.list_per_page
+        
+        return 0
+    
+    def get_throttle_cost(self, request):
+        # Weight of this request in AdminCostThrottle
+        return get_throttle_cost(self.action, self.get_throttle_rows(request))
+    
+    @timed('resolve')
     def get_model_register_admin(self):
+        # Reuse the resolution made earlier in this request (e.g. by the permission check)
+        if getattr(self, '_model_register_admin', None) is not None:
+            return self._model_register_admin
+        
         # Extract the 'app_name' and 'model_name' from the URL kwargs
         app_name = self.kwargs['app_name'].lower()
         model_name = self.kwargs['model_name'].lower()
@@ -47,21 +189,30 @@ class AdminModelViewSet(viewsets.ViewSet,
             raise ParseError({'message': 'Admin register does not exist.'})
 
         # Return the retrieved model and its associated admin instance
-        return model, register_app
+        self._model_register_admin = model, register_app
+        return self._model_register_admin
     
-    def get_object(self, register_app):
+    def get_object_pk(self):
         # Extract the primary key ('pk') from the URL kwargs
         pk = self.kwargs['pk']
 
         try:
             # Attempt to convert the primary key to an integer
-            pk = int(pk)
+            return int(pk)
         except ValueError:
             # Handle the case where the primary key is not a valid integer
             raise ParseError({'message': 'ID must be a number.'})
+    
+    @timed('object')
+    def get_object(self, register_app, queryset=None):
+        pk = self.get_object_pk()
 
-        # Attempt to retrieve the object using the register_app's get_object method
-        instance = register_app.get_object(self.request, pk)
+        if queryset is None:
+            # Attempt to retrieve the object using the register_app's get_object method
+            instance = register_app.get_object(self.request, pk)
+        else:
+            # Retrieve the object from a queryset adjusted by the caller
+            instance = queryset.filter(pk=pk).first()
 
         if instance is None:
             # Handle the case where the object is not found
@@ -75,6 +226,7 @@ class AdminModelViewSet(viewsets.ViewSet,
         # Return the retrieved instance
         return instance
 
+    @timed('object')
     def get_objects(self, register_app):
         '''
         The get_objects method retrieves a list of objects based on a comma-separated list of primary keys from the URL kwargs.
@@ -143,8 +295,9 @@ class AdminModelViewSet(viewsets.ViewSet,
                 # If model is not provided in kwargs, get it from the method you defined
                 model, _ = self.get_model_register_admin()
 
+            fields = kwargs.pop('fields', '__all__')
             serializer_class = DynamicSerializer
-            return serializer_class(model=model, fields='__all__', *args, **kwargs)
+            return serializer_class(model=model, fields=fields, *args, **kwargs)
 
     def get_list_display_data(self, data):
         """_summary_
@@ -217,8 +370,8 @@ class AdminModelViewSet(viewsets.ViewSet,
                                 lookup = query.lookup_name
                                 value = query.rhs
                                 query_params.append(f'{field_name}__{lookup}={value}')
-                            except Exception as e:
-                                print(e)
+                            except Exception:
+                                logger.debug('Unable to turn %r into a query parameter', query, exc_info=True)
 
                     query_params = '&'.join(query_params)
                     api_link += f'?{query_params}'
@@ -233,6 +386,18 @@ class AdminModelViewSet(viewsets.ViewSet,
                     "editable": editable,
                     'api_link': api_link,
                 }
+                
+                # Paginated choices for pickers, see lookup_data
+                source_opts = field.model._meta
+                if not field.auto_created and field.model in admin.site._registry:
+                    data['lookup_link'] = request.build_absolute_uri(reverse(
+                        'admin_mis:admin-lookup-data',
+                        kwargs={
+                            'app_name': source_opts.app_label,
+                            'model_name': source_opts.model_name,
+                            'field_name': field.name,
+                        }
+                    ))
         else:
             # For non-relational fields
             data = {
@@ -340,8 +505,13 @@ class AdminModelViewSet(viewsets.ViewSet,
         This method collects information about each field, similar to the 
         get_fields_meta_data method. 
         Additionally, it seems to handle the pk_related_name field separately.
+        
+        Returns:
+            data (list), pk_related_name (str), dynamic (list): (index, field, editable)
+            of the fields whose defaults or validator limits are evaluated per request
         """
         data = []
+        dynamic = []
         pk_related_name = None  # Initialize pk_related_name
 
         for field in fields:
@@ -359,43 +529,107 @@ class AdminModelViewSet(viewsets.ViewSet,
             # Extract pk_related_name if available
             pk_related_name = result.pop('pk_related_name', None)
             
+            if not field.is_relation and has_dynamic_meta(field):
+                dynamic.append((len(data), field, editable))
+            
             data.append(result)
 
-        return data, pk_related_name
+        return data, pk_related_name, dynamic
+    
+    def get_inline_schema(self, request, inline_model):
+        """_summary_
+        The get_inline_schema method returns the user independent part of an inline's
+        metadata (fields, names and the static form counts). It is computed once per
+        inline class, parent model, read-only fields, host and language, and the
+        INLINE_SCHEMA_CACHE_SIZE most recently used schemas are kept.
+        
+        Fields with callable defaults or validator limits are described again
+        on each call, so their values stay current.
+        """
+        read_only_data = tuple(inline_model.get_readonly_fields(request))
+        parent_label = inline_model.parent_model._meta.label
+        key = (
+            type(inline_model), inline_model.parent_model, read_only_data,
+            request.build_absolute_uri('/'), get_language(),
+        )
+        
+        with _inline_schema_lock:
+            schema = _inline_schema_cache.get(key)
+            if schema is not None:
+                _inline_schema_cache.move_to_end(key)
+        
+        record_cache('inline_schema', schema is not None)
+        if schema is None:
+            schema = self.build_inline_schema(request, inline_model, read_only_data)
+            
+            with _inline_schema_lock:
+                _inline_schema_cache[key] = schema
+                while len(_inline_schema_cache) > INLINE_SCHEMA_CACHE_SIZE:
+                    _inline_schema_cache.popitem(last=False)
+        
+        if not schema['dynamic']:
+            return schema
+        
+        fields = list(schema['fields'])
+        for index, field, editable in schema['dynamic']:
+            fields[index] = self.get_field_meta(request, field, editable, parent_label)
+        return {**schema, 'fields': fields}
+    
+    def build_inline_schema(self, request, inline_model, read_only_data):
+        # Get fields and related name from inline models
+        fields, pk_related_name, dynamic = self.get_inline_fields_meta_data(
+            request=request, fields=inline_model.model._meta.get_fields(),
+            parent_label=inline_model.parent_model._meta.label, read_only_data=read_only_data
+        )
+        
+        schema = {
+            'fields': fields,
+            'dynamic': dynamic,
+            'pk_related_name': pk_related_name,
+            'model_name': inline_model.model._meta.model_name,
+            'verbose_name': inline_model.model._meta.verbose_name.lower().replace(' ', '_'),
+            'app_name': inline_model.model._meta.app_label,
+            'counts': {},
+        }
+        
+        # Counts left to the InlineModelAdmin defaults are plain attributes
+        for name in ('max_num', 'min_num', 'extra'):
+            method = f'get_{name}'
+            if getattr(type(inline_model), method) is getattr(InlineModelAdmin, method):
+                schema['counts'][name] = getattr(inline_model, name)
+        
+        return schema
     
     def get_inline_field_data(self, request, final_data, inlines, nest_inline_name=None):
         """_summary_
         The get_inline_field_data method seems to be responsible for collecting metadata 
         and information about inline models in a Django admin view. 
+        
+        The schema comes from get_inline_schema; form counts that depend on the
+        request and the permissions are added per request.
         """
         inline_data = []
         
         for inline_model in inlines:
-            # Get read-only fields and parent label
-            read_only_data = inline_model.get_readonly_fields(request)
-            parent_label = inline_model.parent_model._meta.label
-            
-            # Get fields and related name from inline models
-            fields = inline_model.model._meta.get_fields()
-            fields, pk_related_name = self.get_inline_fields_meta_data(
-                request=request, fields=fields,
-                parent_label=parent_label, read_only_data=read_only_data
-            )
+            schema = self.get_inline_schema(request, inline_model)
             
-            # Determine inline name
+            # Determine inline name, nested inlines get the path from the top-level inline
             if nest_inline_name is None:
-                inline_name = inline_model.model._meta.verbose_name.lower().replace(' ', '_')
+                inline_name = schema['verbose_name']
+            elif isinstance(nest_inline_name, list):
+                inline_name = [*nest_inline_name, schema['pk_related_name']]
             else:
-                inline_name = nest_inline_name, pk_related_name
+                inline_name = [nest_inline_name, schema['pk_related_name']]
             
+            counts = schema['counts']
             data = {
-                'fields': fields,
-                'model_name': inline_model.model._meta.model_name,
+                'fields': schema['fields'],
+                'model_name': schema['model_name'],
                 'inline_name': inline_name,
-                'app_name': inline_model.model._meta.app_label,
-                'max_num': inline_model.get_max_num(request),
-                'min_num': inline_model.get_min_num(request),
-                'extra': inline_model.get_extra(request),
+                'app_name': schema['app_name'],
+                'max_num': counts['max_num'] if 'max_num' in counts else inline_model.get_max_num(request),
+                'min_num': counts['min_num'] if 'min_num' in counts else inline_model.get_min_num(request),
+                'extra': counts['extra'] if 'extra' in counts else inline_model.get_extra(request),
                 'perms': {
                     "add": inline_model.has_add_permission(request, None),
                     "change": inline_model.has_change_permission(request, None),
@@ -414,23 +648,37 @@ class AdminModelViewSet(viewsets.ViewSet,
         
         final_data['inlines'] = inline_data
 
-    def get_inline_object_data(self, request, final_data, inline_instances, parent_instance):
+    def get_inline_queryset(self, request, inline_instance, parent_instance):
+        '''
+        The get_inline_queryset method returns the queryset of inline objects
+        related to the parent instance.
+        '''
+        # Prepare filter keyword arguments to retrieve related objects
+        kwargs = {inline_instance.get_formset(request, parent_instance).fk.name: parent_instance.id}
+        return inline_instance.model.objects.filter(**kwargs)
+    
+    @timed('inlines')
+    def get_inline_object_data(self, request, final_data, inline_instances, parent_instance, inline_objects=None):
         '''
         The get_inline_object_data method appears to be responsible for 
         retrieving data for inline instances associated with a parent instance in a Django admin view. 
+        
+        inline_objects optionally holds the already fetched objects of each inline instance.
         '''
         inline_data = []
         
-        for inline_instance in inline_instances:
-            # Prepare filter keyword arguments to retrieve related objects
-            kwargs = {inline_instance.get_formset(request, parent_instance).fk.name: parent_instance.id}
-            
+        for index, inline_instance in enumerate(inline_instances):
             inline_model = inline_instance.model
-            objects = list(inline_model.objects.filter(**kwargs))
+            
+            if inline_objects is not None:
+                objects = inline_objects[index]
+            else:
+                objects = list(self.get_inline_queryset(request, inline_instance, parent_instance))
             
             if not objects:
                 continue
             
+            self.record_rows(len(objects))
             nested_data = []
             for instance in objects:
                 data = {
@@ -459,7 +707,11 @@ class AdminModelViewSet(viewsets.ViewSet,
         if inline_data:
             final_data['inlines'] = inline_data
     
-    def list(self, request, *args, **kwargs):
+    def get_menu_data(self, request):
+        """_summary_
+        The get_menu_data method lists the apps and models the user can access,
+        with their permissions and URLs.
+        """
         app_dict = {
             'admin_meta_data' : {
                 'site_header' : admin.site.site_header,
@@ -503,12 +755,24 @@ class AdminModelViewSet(viewsets.ViewSet,
                     "app_models": [model_dict],
                 }
         
-        return Response(app_dict.values())
+        return list(app_dict.values())
     
-    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)')
-    def list_display_data(self, request, *args, **kwargs):
-        _, register_app = self.get_model_register_admin()
-        
+    def list(self, request, *args, **kwargs):
+        data = get_or_compute(
+            'menu', (get_user_key(request), get_language()),
+            lambda: self.get_menu_data(request), wait=not is_asgi_request(request)
+        )
+        return Response(data)
+    
+    def clean_changelist_params(self, request, register_app):
+        """_summary_
+        The clean_changelist_params method removes every query parameter
+        the ChangeList does not understand (search, ordering, page and the 
+        admin's list filters) so it does not raise on unknown lookups.
+
+        Returns:
+            filter_list (str): value of the 'filter_list' query parameter
+        """
         all_terms = ['q', 'o', 'p']
         for filter_ in register_app.get_list_filter(request):
             if callable(filter_):
@@ -525,65 +789,199 @@ class AdminModelViewSet(viewsets.ViewSet,
             for key in list(request.query_params.keys())
             if key.split('__')[0] not in all_terms
         ]
-        list_display = register_app.get_list_display(request)
-        
+        return filter_list
+    
+    def get_changelist(self, request, register_app, defer_results=False):
         try:
-            ch_inst = register_app.get_changelist_instance(request) 
+            return get_changelist_instance(register_app, request, defer_results=defer_results) 
         except Exception as e:
             raise ParseError({
                 'message' : f'Error due to {e}'
             })
-            
+    
+    @timed('results')
+    def load_changelist(self, request, ch_inst):
+        # COUNT queries are shared between workers when a cache is configured
+        get_count = None
+        if get_cache() is not None:
+            get_count = partial(get_cached_count, wait=not is_asgi_request(request))
+        try:
+            return load_changelist_results(ch_inst, request, get_count)
+        except Exception as e:
+            raise ParseError({
+                'message' : f'Error due to {e}'
+            })
+    
+    def get_geometry_option(self, request):
+        """_summary_
+        The get_geometry_option method parses the 'geom' query parameter, which
+        selects how geometry columns are returned: bbox, simplified:<tolerance>,
+        centroid or none.
+        """
+        value = request.query_params.get('geom')
+        if not value:
+            return None
+        
+        from .geometry import GeometryOption
+        return GeometryOption.parse(value)
+    
+    def get_layout(self, request):
+        """_summary_
+        The get_layout method parses the 'layout' query parameter of list pages:
+        records (one object per row, the default), rows (one array per row) or
+        columnar (one array per column).
+        """
+        layout = request.query_params.get('layout', 'records')
+        if layout not in LIST_LAYOUTS:
+            raise ParseError({
+                'message' : f'Layout must be one of {", ".join(LIST_LAYOUTS)}.'
+            })
+        return layout
+    
+    @timed('changelist')
+    def prepare_changelist(self, request, register_app):
+        """_summary_
+        The prepare_changelist method builds a ChangeList whose results are not
+        loaded yet, with the per-request queryset options (geometry) applied.
+        
+        Returns:
+            ch_inst (ChangeList), filter_list (str)
+        """
+        geometry_option = self.get_geometry_option(request)
+        layout = self.get_layout(request)
+        filter_list = self.clean_changelist_params(request, register_app)
+        ch_inst = self.get_changelist(request, register_app, defer_results=True)
+        
+        # Admins with their own get_changelist_instance have their results loaded already
+        if getattr(ch_inst, 'results_loaded', True):
+            geometry_option = None
+        
+        if geometry_option is not None:
+            ch_inst.queryset = geometry_option.apply(ch_inst.queryset)
+        ch_inst.geometry_option = geometry_option
+        ch_inst.layout = layout
+        
+        return ch_inst, filter_list
+    
+    @timed('serialize')
+    def get_changelist_data(self, request, register_app, ch_inst, filter_list=None):
+        """_summary_
+        The get_changelist_data method serializes the current page of a ChangeList
+        using the admin's list_display.
+        """
+        list_display = register_app.get_list_display(request)
         queryset = ch_inst.result_list
+        layout = getattr(ch_inst, 'layout', 'records')
+        columns = None
         
         if filter_list == 'true':
             data = self.get_list_display_data(queryset)
+            row_count = len(data)
             
         else:
-            data = []
-            for quer in queryset.iterator():
-                da = {}
-                if 'id' not in list_display:
-                    da['id'] = getattr(quer, 'id')
-                    
-                for i in list_display:
-                    
-                    if hasattr(register_app, i) and i != '__str__':
-                        da[i] = getattr(register_app, i)(quer)
-                        
-                    else:
-                        value = getattr(quer, i)
-                        if callable(value):
-                            da[i] = value()
-                            
-                        else:
-                            da[i] = str(value) if hasattr(value, 'pk') else value
-
-                data.append(da)
+            # Custom paginators may hand over rows that were already fetched
+            if not isinstance(queryset, list):
+                queryset = queryset.iterator()
+            
+            columns = get_column_plan(register_app, list_display)
+            
+            geometry_option = getattr(ch_inst, 'geometry_option', None)
+            if geometry_option is not None:
+                queryset = map(geometry_option.restore, queryset)
+                columns = geometry_option.filter_columns(columns)
+            
+            if layout == 'records':
+                data = [
+                    {name: get_value(quer) for name, get_value in columns}
+                    for quer in queryset
+                ]
+                row_count = len(data)
+                
+            elif layout == 'rows':
+                # Tuples, no per-row dict or key repetition
+                getters = [get_value for _, get_value in columns]
+                data = [tuple([get_value(quer) for get_value in getters]) for quer in queryset]
+                row_count = len(data)
+                
+            else:
+                rows = list(queryset)
+                data = [[get_value(quer) for quer in rows] for _, get_value in columns]
+                row_count = len(rows)
         
+        self.record_rows(row_count)
         data = {
             'count' : ch_inst.result_count,
             'data_per_page' : ch_inst.list_per_page,
             'data' : data
         }
         
+        # Column names are sent once for the array layouts
+        if columns is not None and layout != 'records':
+            data['layout'] = layout
+            data['columns'] = [name for name, _ in columns]
+        
         if ch_inst.date_hierarchy:
+            # The admin_list template tag library is only loaded by admins using it
+            from django.contrib.admin.templatetags.admin_list import date_hierarchy
             data['date_hierarchy_data'] = date_hierarchy(ch_inst)
             
+        return data
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)')
+    def list_display_data(self, request, *args, **kwargs):
+        _, register_app = self.get_model_register_admin()
+        
+        ch_inst, filter_list = self.prepare_changelist(request, register_app)
+        self.load_changelist(request, ch_inst)
+        
+        data = self.get_changelist_data(request, register_app, ch_inst, filter_list)
         return Response(data, status=status.HTTP_200_OK)
     
-    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/filters')
-    def list_filter_data(self, request, *args, **kwargs):
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/export')
+    def export_data(self, request, *args, **kwargs):
+        """_summary_
+        The export_data action streams every row matching the search, filter and 
+        ordering parameters of list_display_data as CSV or NDJSON.
+        
+        The ChangeList results are never loaded, so no page or COUNT query is made;
+        rows are read in chunks of 'chunk_size' from a server-side cursor.
+        """
         model, register_app = self.get_model_register_admin()
         
-        if hasattr(request.query_params, '_mutable'):
-            request.query_params._mutable = True
+        from .streaming import EXPORT_FORMATS, export_response
+        
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            raise ParseError({
+                'message' : f'File format must be one of {", ".join(EXPORT_FORMATS)}.'
+            })
+        
+        try:
+            chunk_size = int(request.query_params.get('chunk_size', EXPORT_CHUNK_SIZE))
+        except ValueError:
+            raise ParseError({'message': 'Chunk size must be a number.'})
+        chunk_size = min(max(chunk_size, 1), EXPORT_MAX_CHUNK_SIZE)
         
-        request.query_params.clear()
+        ch_inst, _ = self.prepare_changelist(request, register_app)
         
+        columns = get_column_plan(register_app, register_app.get_list_display(request))
+        geometry_option = ch_inst.geometry_option
+        if geometry_option is not None:
+            columns = geometry_option.filter_columns(columns)
+        return export_response(
+            request, ch_inst.queryset, columns, file_format,
+            filename=model._meta.model_name, chunk_size=chunk_size,
+            prepare=geometry_option.restore if geometry_option else None
+        )
+    
+    @timed('filters')
+    def get_filters_data(self, request, model, register_app, ch_inst):
+        """_summary_
+        The get_filters_data method describes the filters, ordering, search,
+        actions and list_display available on a ChangeList.
+        """
         data = {}
-        ch_inst = register_app.get_changelist_instance(request) 
-
+        
         absolute_url = request.build_absolute_uri('/')
         if ch_inst.has_filters:
             filter_specs = ch_inst.filter_specs
@@ -629,6 +1027,8 @@ class AdminModelViewSet(viewsets.ViewSet,
         }
         
         if ch_inst.date_hierarchy:
+            # The admin_list template tag library is only loaded by admins using it
+            from django.contrib.admin.templatetags.admin_list import date_hierarchy
             data['date_hierarchy_data'] = date_hierarchy(ch_inst)
         
         actions_list = []
@@ -642,14 +1042,279 @@ class AdminModelViewSet(viewsets.ViewSet,
             data['actions'] = actions_list
         
         data['list_display'] = register_app.get_list_display(request)
+        return data
+    
+    def get_cached_filters_data(self, request, model, register_app):
+        """_summary_
+        The get_cached_filters_data method describes the filters of the model's
+        unfiltered ChangeList, shared through the cache by the filters and
+        bootstrap actions. The query parameters of the request are ignored,
+        so the choices do not depend on the filters currently applied.
+        """
+        def get_data():
+            # The filters need neither the page of results nor the request's
+            # parameters, which are put back for the list of bootstrap_data
+            http_request = request._request
+            query_params = http_request.GET
+            http_request.GET = QueryDict()
+            try:
+                ch_inst = self.get_changelist(request, register_app, defer_results=True)
+                return self.get_filters_data(request, model, register_app, ch_inst)
+            finally:
+                http_request.GET = query_params
+        
+        from .invalidation import get_versions
+        
+        # Filter choices are read from the data, writes invalidate them
+        key = (
+            model._meta.label_lower, get_user_key(request), get_language(),
+            request.build_absolute_uri('/'), get_versions([model]),
+        )
+        return get_or_compute('filters', key, get_data, wait=not is_asgi_request(request))
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/filters')
+    def list_filter_data(self, request, *args, **kwargs):
+        model, register_app = self.get_model_register_admin()
+        data = self.get_cached_filters_data(request, model, register_app)
         return Response(data, status=status.HTTP_200_OK)
     
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/bootstrap')
+    def bootstrap_data(self, request, *args, **kwargs):
+        """_summary_
+        The bootstrap_data action returns everything a changelist screen needs
+        on first render: the field metadata, the filters and the first page.
+        
+        The model is resolved once and the model permissions are evaluated
+        once. The field metadata and the filters are the cached ones of the
+        fields and filters actions; the filters describe the unfiltered list.
+        """
+        model, register_app = self.get_model_register_admin()
+        
+        ch_inst, filter_list = self.prepare_changelist(request, register_app)
+        self.load_changelist(request, ch_inst)
+        
+        data = {
+            'fields' : self.get_cached_model_fields_data(request, model, register_app),
+            'filters' : self.get_cached_filters_data(request, model, register_app),
+            'list' : self.get_changelist_data(request, register_app, ch_inst, filter_list),
+        }
+        return Response(data, status=status.HTTP_200_OK)
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/changes')
+    def list_changes_data(self, request, *args, **kwargs):
+        """_summary_
+        The list_changes_data action is a change feed built from the admin LogEntry
+        table. It returns the objects added, changed or deleted after the 'since'
+        cursor, the latest state per object, with added and changed objects
+        serialized like list_display_data rows. Objects still existing but no
+        longer in the admin's queryset are reported as removed.
+        
+        Log entries are numbered when they are written, not when their transaction
+        commits, so the entries of the ADMIN_MIS_CHANGES_OVERLAP seconds before the
+        cursor are read again: clients get them twice and apply them idempotently.
+        
+        Without 'since', only the current cursor is returned.
+        """
+        model, register_app = self.get_model_register_admin()
+        content_type = get_content_type_for_model(model)
+        
+        try:
+            limit = int(request.query_params.get('limit', CHANGES_LIMIT))
+        except ValueError:
+            raise ParseError({'message': 'Limit must be a number.'})
+        limit = min(max(limit, 1), CHANGES_MAX_LIMIT)
+        
+        entries = LogEntry.objects.filter(content_type=content_type)
+        since = request.query_params.get('since')
+        
+        if since is None:
+            cursor = entries.aggregate(cursor=Max('id'))['cursor'] or 0
+            return Response({'cursor': cursor, 'changes': [], 'has_more': False})
+        
+        try:
+            since = int(since)
+        except ValueError:
+            raise ParseError({'message': 'Cursor must be a number.'})
+        
+        fields = ('id', 'object_id', 'action_flag', 'action_time')
+        new_entries = list(
+            entries.filter(id__gt=since).order_by('id').values_list(*fields)[:limit + 1]
+        )
+        has_more = len(new_entries) > limit
+        new_entries = new_entries[:limit]
+        
+        # Entries before the cursor whose transaction may have committed after it
+        overlap = getattr(settings, 'ADMIN_MIS_CHANGES_OVERLAP', CHANGES_OVERLAP)
+        since_time = entries.filter(id=since).values_list('action_time', flat=True).first()
+        late_entries = []
+        if since_time is not None and overlap:
+            late_entries = list(
+                entries.filter(
+                    id__lte=since, action_time__gte=since_time - timedelta(seconds=overlap)
+                ).order_by('id').values_list(*fields)[:CHANGES_MAX_LIMIT]
+            )
+        
+        # Latest entry per object, in log order; an addition stays one when changed later
+        latest = {}
+        added = set()
+        for entry in late_entries + new_entries:
+            object_id, action_flag = entry[1], entry[2]
+            if action_flag == ADDITION:
+                added.add(object_id)
+            elif action_flag == DELETION:
+                added.discard(object_id)
+            latest.pop(object_id, None)
+            latest[object_id] = entry
+        
+        changed_ids = [
+            object_id for object_id, entry in latest.items()
+            if entry[2] != DELETION
+        ]
+        
+        rows = {}
+        if changed_ids:
+            columns = get_column_plan(register_app, register_app.get_list_display(request))
+            queryset = register_app.get_queryset(request).filter(pk__in=changed_ids)
+            for obj in queryset:
+                rows[str(obj.pk)] = {name: get_value(obj) for name, get_value in columns}
+        
+        changes = []
+        for object_id, (_, _, action_flag, action_time) in latest.items():
+            row = rows.get(object_id)
+            if action_flag == DELETION:
+                change_action = 'deleted'
+            elif row is None:
+                # Deleted outside the admin, or filtered out by its get_queryset
+                change_action = 'removed'
+            elif object_id in added:
+                change_action = 'added'
+            else:
+                change_action = CHANGE_ACTIONS[action_flag]
+            
+            changes.append({
+                'pk': object_id,
+                'action': change_action,
+                'action_time': action_time,
+                'data': row,
+            })
+        
+        self.record_rows(len(rows))
+        return Response({
+            'cursor': new_entries[-1][0] if new_entries else since,
+            'changes': changes,
+            'has_more': has_more,
+        }, status=status.HTTP_200_OK)
+    
+    def get_lookup_queryset(self, request, register_app, field):
+        """_summary_
+        The get_lookup_queryset method returns the choices of a relational field
+        as the admin's form offers them (formfield_for_foreignkey/manytomany and
+        limit_choices_to), together with the admin of the related model.
+        """
+        if not field.is_relation or field.auto_created or not (field.many_to_one or field.many_to_many or field.one_to_one):
+            raise ParseError({'message': f'{field.name} is not a relational field.'})
+        
+        related_admin = admin.site._registry.get(field.related_model)
+        if related_admin is None:
+            raise ParseError({'message': 'Admin register of the related model does not exist.'})
+        
+        if not related_admin.has_view_permission(request):
+            raise PermissionDenied()
+        
+        formfield = register_app.formfield_for_dbfield(field, request)
+        if formfield is None or not hasattr(formfield, 'queryset'):
+            raise ParseError({'message': f'{field.name} is not editable.'})
+        
+        queryset = formfield.queryset
+        limit_choices_to = formfield.get_limit_choices_to()
+        if limit_choices_to:
+            queryset = queryset.complex_filter(limit_choices_to)
+        
+        return queryset, related_admin, formfield.to_field_name or field.related_model._meta.pk.name
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/lookup/(?P<field_name>\w+)')
+    def lookup_data(self, request, *args, **kwargs):
+        """_summary_
+        The lookup_data method lists the choices of a foreign key or many-to-many
+        field for pickers, as id/display pairs.
+        
+        The 'q' query parameter is matched with the related admin's search_fields.
+        Pages are read with a keyset on the primary key ('after' is the 'cursor'
+        of the previous page) and no COUNT query; the 'id' of a choice is the
+        value the form expects, which is the to_field_name column when the
+        field has one. Only the columns listed in the related admin's
+        lookup_fields are read, when it sets them.
+        """
+        model, register_app = self.get_model_register_admin()
+        
+        try:
+            field = model._meta.get_field(kwargs['field_name'])
+        except FieldDoesNotExist:
+            raise ParseError({'message': 'Field does not exist.'})
+        
+        queryset, related_admin, value_field = self.get_lookup_queryset(request, register_app, field)
+        # The keyset is on the primary key: a to_field column may be unindexed
+        pk_field = queryset.model._meta.pk
+        
+        try:
+            limit = int(request.query_params.get('limit', LOOKUP_LIMIT))
+        except ValueError:
+            raise ParseError({'message': 'Limit must be a number.'})
+        limit = min(max(limit, 1), LOOKUP_MAX_LIMIT)
+        
+        search_term = request.query_params.get('q')
+        if search_term:
+            queryset, may_have_duplicates = related_admin.get_search_results(request, queryset, search_term)
+            if may_have_duplicates:
+                queryset = queryset.distinct()
+        
+        after = request.query_params.get('after')
+        if after:
+            try:
+                after = pk_field.to_python(after)
+            except ValidationError:
+                raise ParseError({'message': 'Cursor is not a valid id.'})
+            queryset = queryset.filter(pk__gt=after)
+        
+        lookup_fields = getattr(related_admin, 'lookup_fields', None)
+        if lookup_fields:
+            # Joins are kept for the relations lookup_fields reads (e.g. 'content_type__model')
+            related = {name.rsplit('__', 1)[0] for name in lookup_fields if '__' in name}
+            queryset = queryset.select_related(None).select_related(*related).only(
+                pk_field.name, value_field, *lookup_fields
+            )
+        
+        objects = list(queryset.order_by('pk')[:limit + 1])
+        has_more = len(objects) > limit
+        objects = objects[:limit]
+        
+        results = [
+            {'id': getattr(obj, value_field), 'display': str(obj)}
+            for obj in objects
+        ]
+        
+        self.record_rows(len(results))
+        return Response({
+            'results': results,
+            'cursor': objects[-1].pk if objects else None,
+            'has_more': has_more,
+        }, status=status.HTTP_200_OK)
+    
     @transaction.atomic
     def posting_data(self, request, model, register_app, change, instance):
         fieldsets = register_app.get_fieldsets(request)
+        fields = flatten_fieldsets(fieldsets)
+        
+        # Feature modules, loaded by the first write
+        from .events import publish_change
+        from .m2m import (add_changed_fields_message, clean_m2m_diff_fields,
+                          get_m2m_diff_fields, save_m2m_diff)
+        
+        # Fields in the admin's m2m_diff_fields are saved by save_m2m_diff, outside the form
+        diff_fields = get_m2m_diff_fields(request, register_app, fields)
         ModelForm = register_app.get_form(
             request, obj=instance, change=change,
-            fields=flatten_fieldsets(fieldsets)
+            fields=[name for name in fields if name not in diff_fields]
         )
         
         form = ModelForm(request.data, request.FILES, instance=instance)
@@ -661,21 +1326,30 @@ class AdminModelViewSet(viewsets.ViewSet,
         
         form_validated = form.is_valid()
         all_formset_validated = all_valid(formsets)
-        if all_formset_validated and form_validated:
+        diff_values, diff_errors = clean_m2m_diff_fields(diff_fields, request.data, request.FILES)
+        if all_formset_validated and form_validated and not diff_errors:
             instance = register_app.save_form(request, form, change=change)
             
             register_app.save_model(request, instance, form, change)
             register_app.save_related(request, form, formsets, change)
             
+            changed_names = [
+                name for name, pks in diff_values.items()
+                if save_m2m_diff(instance, diff_fields[name][0], pks)
+            ]
+            
             change_message = register_app.construct_change_message(
-                request, form, formsets, True
+                request, form, formsets, not change
             )
             
             if change:
+                add_changed_fields_message(change_message, diff_fields, changed_names)
                 register_app.log_change(request, instance, change_message)
             else:
                 register_app.log_addition(request, instance, change_message)
             
+            publish_change(model, 'changed' if change else 'added', [instance.pk])
+            
             ser = self.get_serializer(model=model, instance=instance).data
             ser['perms'] = {
                 "change": register_app.has_change_permission(request, instance),
@@ -690,6 +1364,7 @@ class AdminModelViewSet(viewsets.ViewSet,
                     
         else:
             errors = form.errors or {}
+            errors.update(diff_errors)
             for inline_formset in formsets:
                 if not inline_formset.is_valid() and inline_formset.errors:
                     inlines = errors.get('inlines', []) 
@@ -716,10 +1391,12 @@ class AdminModelViewSet(viewsets.ViewSet,
         data = self.posting_data(request, model, register_app, change, None)
         return Response(data)
             
-    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/fields')
-    def list_field_meta(self, request, *args, **kwargs):
-        model, register_app = self.get_model_register_admin()
-        
+    @timed('fields')
+    def get_model_fields_data(self, request, model, register_app, perms=None):
+        """_summary_
+        The get_model_fields_data method builds the field and inline metadata
+        of the admin's add form, together with the model permissions.
+        """
         fieldsets = register_app.get_fieldsets(request)
         fieldsets = flatten_fieldsets(fieldsets)
         form = register_app.get_form(
@@ -739,37 +1416,176 @@ class AdminModelViewSet(viewsets.ViewSet,
             model_admin=register_app,
         )
         
-        final_data = []
         admin_fields = admin_form.fields
-        
         fields = model._meta.get_fields()
-        register_app = admin.site._registry[model]
         
         final_data = {
             'fields' : self.get_fields_meta_data(
                 request=request, fields=fields, 
                 admin_fields=admin_fields
             ),
-            'perms' : register_app.get_model_perms(request)
+            'perms' : perms if perms is not None else register_app.get_model_perms(request)
         }
         
         if inline_instances:
             self.get_inline_field_data(request, final_data, inline_instances)
             
-        return Response(final_data, status=status.HTTP_200_OK)
+        return final_data
+            
+    def get_cached_model_fields_data(self, request, model, register_app):
+        """_summary_
+        The get_cached_model_fields_data method returns get_model_fields_data
+        through the shared cache. Callable defaults and validator limits are
+        evaluated again on each call, so they do not stay frozen in the cache.
+        """
+        key = (
+            model._meta.label_lower, get_user_key(request), get_language(),
+            request.build_absolute_uri('/'),
+        )
+        final_data = get_or_compute(
+            'fields', key, lambda: self.get_model_fields_data(request, model, register_app),
+            wait=not is_asgi_request(request)
+        )
+        return refresh_dynamic_meta(final_data, model)
     
-    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)')
-    def retrieve_data(self, request, *args, **kwargs):
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/fields')
+    def list_field_meta(self, request, *args, **kwargs):
         model, register_app = self.get_model_register_admin()
-        instance = self.get_object(register_app)
         
-        ser = self.get_serializer(model=model, instance=instance).data
+        final_data = self.get_cached_model_fields_data(request, model, register_app)
+        return Response(final_data, status=status.HTTP_200_OK)
+    
+    def get_field_selection(self, request, model, register_app):
+        """_summary_
+        The get_field_selection method works out which fields retrieve_data
+        serializes, from the 'fields' and 'exclude' query parameters and
+        the admin's lazy_fields.
+        
+        Lazy fields (large binary, geometry or JSON columns) are left out unless
+        they are asked for explicitly in 'fields'.
+
+        Returns:
+            fields (list): names of the serialized fields, or None for all of them
+            left_out (list): names of the fields which are not serialized
+        """
+        opts = model._meta
+        all_fields = [field.name for field in opts.concrete_fields] + [
+            field.name for field in opts.many_to_many
+        ]
+        
+        requested = request.query_params.get('fields')
+        excluded = request.query_params.get('exclude')
+        lazy_fields = getattr(register_app, 'lazy_fields', ())
+        
+        if not (requested or excluded or lazy_fields):
+            return None, []
+        
+        if requested:
+            fields = [name for name in requested.split(',') if name]
+        else:
+            fields = [name for name in all_fields if name not in lazy_fields]
+            
+        if excluded:
+            excluded = [name for name in excluded.split(',') if name]
+            fields = [name for name in fields if name not in excluded]
+        
+        unknown = set(fields).union(excluded or ()).difference(all_fields)
+        if unknown:
+            raise ParseError({
+                'message' : f'Unknown fields: {", ".join(sorted(unknown))}.'
+            })
+        
+        # The primary key is always returned
+        if opts.pk.name not in fields:
+            fields.insert(0, opts.pk.name)
+            
+        left_out = [name for name in all_fields if name not in fields]
+        return fields, left_out
+    
+    def get_field_links(self, request, names):
+        # URLs fetching the fields left out of retrieve_data one at a time
+        return {
+            name : request.build_absolute_uri(reverse(
+                'admin_mis:admin-retrieve-field-data',
+                kwargs={
+                    'app_name': self.kwargs['app_name'],
+                    'model_name': self.kwargs['model_name'],
+                    'pk': self.kwargs['pk'],
+                    'field_name': name,
+                }
+            ))
+            for name in names
+        }
+    
+    def get_retrieve_queryset(self, request, model, register_app):
+        """_summary_
+        The get_retrieve_queryset method applies the field selection and the
+        geometry option of the request to the admin queryset.
+        
+        Returns:
+            queryset: adjusted queryset, or None when the admin's get_object can be used as is
+        """
+        self.retrieve_fields, self.lazy_field_names = self.get_field_selection(
+            request, model, register_app
+        )
+        self.geometry_option = self.get_geometry_option(request)
+        
+        concrete_fields = {field.name for field in model._meta.concrete_fields}
+        deferred = [name for name in self.lazy_field_names if name in concrete_fields]
+        
+        if not deferred and self.geometry_option is None:
+            return None
+        
+        queryset = register_app.get_queryset(request)
+        if deferred:
+            # Columns which are not returned are not read either
+            queryset = queryset.defer(*deferred)
+            
+        if self.geometry_option is not None:
+            queryset = self.geometry_option.apply(queryset)
+            
+        return queryset
+    
+    @timed('serialize')
+    def get_retrieve_data(self, request, model, register_app, instance):
+        """_summary_
+        The get_retrieve_data method serializes an object fetched from
+        get_retrieve_queryset, with its permissions.
+        """
+        fields = self.retrieve_fields
+        if self.geometry_option is not None:
+            self.geometry_option.restore(instance)
+            
+            omitted = self.geometry_option.omitted_field_names
+            if omitted:
+                if fields is None:
+                    opts = model._meta
+                    fields = [field.name for field in opts.concrete_fields] + [
+                        field.name for field in opts.many_to_many
+                    ]
+                fields = [name for name in fields if name not in omitted]
+        
+        ser = self.get_serializer(model=model, instance=instance, fields=fields).data
+        self.record_rows(1)
+        if self.lazy_field_names:
+            ser['lazy_fields'] = self.get_field_links(request, self.lazy_field_names)
+            
         ser['perms'] = {
             "add": register_app.has_add_permission(request),
             "change": register_app.has_change_permission(request, instance),
             "delete": register_app.has_delete_permission(request, instance),
             "view": register_app.has_view_permission(request, instance)
         }   
+        return ser
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)')
+    def retrieve_data(self, request, *args, **kwargs):
+        model, register_app = self.get_model_register_admin()
+        
+        queryset = self.get_retrieve_queryset(request, model, register_app)
+        instance = self.get_object(register_app, queryset)
+        
+        ser = self.get_retrieve_data(request, model, register_app, instance)
         
         inline_instances = register_app.get_inline_instances(request, instance)
         if inline_instances and instance:
@@ -777,6 +1593,66 @@ class AdminModelViewSet(viewsets.ViewSet,
         
         return Response(ser, status=status.HTTP_200_OK)
     
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)/field/(?P<field_name>\w+)')
+    def retrieve_field_data(self, request, *args, **kwargs):
+        """_summary_
+        The retrieve_field_data action returns a single field of an object,
+        reading only that column. retrieve_data links here for lazy and excluded fields.
+        """
+        model, register_app = self.get_model_register_admin()
+        
+        try:
+            field = model._meta.get_field(kwargs['field_name'])
+        except Exception:
+            raise ParseError({'message': 'Field does not exist.'})
+        
+        if not (field.concrete or field.many_to_many) or field.auto_created and not field.primary_key:
+            raise ParseError({'message': 'Field does not exist.'})
+        
+        queryset = register_app.get_queryset(request)
+        if field.concrete:
+            queryset = queryset.only(field.name)
+            
+        instance = self.get_object(register_app, queryset)
+        fields = list(dict.fromkeys([model._meta.pk.name, field.name]))
+        
+        data = self.get_serializer(model=model, instance=instance, fields=fields).data
+        return Response(data, status=status.HTTP_200_OK)
+    
+    @action(methods=['GET'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)/download/(?P<field_name>\w+)')
+    def download_field_data(self, request, *args, **kwargs):
+        """_summary_
+        The download_field_data action streams the content of a FileField, ImageField
+        or BinaryField, honoring single HTTP Range requests (206 Partial Content).
+        """
+        model, register_app = self.get_model_register_admin()
+        
+        try:
+            field = model._meta.get_field(kwargs['field_name'])
+        except Exception:
+            raise ParseError({'message': 'Field does not exist.'})
+        
+        if not isinstance(field, (models.FileField, models.BinaryField)):
+            raise ParseError({'message': 'Field is not a file or binary field.'})
+        
+        queryset = register_app.get_queryset(request).only(field.name)
+        instance = self.get_object(register_app, queryset)
+        value = getattr(instance, field.name)
+        
+        if not value:
+            raise ParseError({'message': 'Field has no content.'})
+        
+        from .streaming import binary_response, field_file_response
+        
+        if isinstance(field, models.FileField):
+            try:
+                return field_file_response(request, value)
+            except OSError:
+                raise ParseError({'message': 'File does not exist.'})
+        
+        filename = f'{model._meta.model_name}-{instance.pk}-{field.name}'
+        return binary_response(request, value, filename)
+    
     @action(methods=['POST'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/action',
             serializer_class=ActionSerializer)
     def action_perform(self, request, *args, **kwargs):
@@ -825,6 +1701,9 @@ class AdminModelViewSet(viewsets.ViewSet,
         
         _, name, _ = action_v
         getattr(register_app, name)(request, queryset)
+        
+        from .events import publish_change
+        publish_change(model, 'action', item_ids, name=action)
         all_messages = messages.get_messages(request)
         data = [{
             'message_content' : message.message, 
@@ -864,8 +1743,9 @@ class AdminModelViewSet(viewsets.ViewSet,
     @transaction.atomic
     @action(methods=['DELETE'], detail=False, url_path=r'(?P<app_name>[\w-]+)/(?P<model_name>[\w-]+)/(?P<pk>\w+)/delete')
     def delete_objects(self, request, *args, **kwargs):
-        _, register_app = self.get_model_register_admin()
+        model, register_app = self.get_model_register_admin()
         instances = self.get_objects(register_app)
+        deleted_pks = []
         
         for instance in instances:
             if not register_app.has_delete_permission(request, instance):
@@ -877,7 +1757,14 @@ class AdminModelViewSet(viewsets.ViewSet,
             
             if perms_needed or protected:
                 raise PermissionDenied
+            
+            # Logged before deleting, the change feed reports it to clients
+            register_app.log_deletion(request, instance, str(instance))
+            deleted_pks.append(instance.pk)
             instance.delete()
+        
+        from .events import publish_change
+        publish_change(model, 'deleted', deleted_pks)
             
         message = f'The objects was deleted successfully.'
         return Response({'message':message})
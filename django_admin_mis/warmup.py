@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.signals import request_started
+from django.db import connections
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+# Viewset actions run for each registered model, in this order
+MODEL_ACTIONS = ('list_field_meta', 'list_filter_data')
+
+MODEL_ACTION_PATHS = {
+    'list_field_meta': 'fields/',
+    'list_filter_data': 'filters/',
+}
+
+def get_default_host():
+    # The first concrete entry of ALLOWED_HOSTS, so request.get_host() accepts it
+    for host in settings.ALLOWED_HOSTS:
+        if host not in ('*', '') and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+def get_warmup_users(usernames=None):
+    """
+    Return the users to warm up for: the named ones, or the first active superuser.
+
+    Menu, field and filter cache entries are kept per user, so only the
+    entries of these users are filled in the shared cache.
+    """
+    User = get_user_model()
+    if usernames:
+        return list(User._default_manager.filter(**{f'{User.USERNAME_FIELD}__in': usernames}))
+    return list(User._default_manager.filter(is_active=True, is_superuser=True).order_by('pk')[:1])
+
+def warm_up(users=None, models=None, host=None, secure=False, languages=None):
+    """
+    Run the menu, fields and filters endpoints of every registered model.
+
+    This fills the shared cache when ADMIN_MIS_CACHE is set, and the caches
+    of the current process on the way. No list page is loaded. Returns a list
+    of (label, action, status_code, seconds) tuples; failures are logged and
+    reported with a None status code.
+    """
+    # Test tooling and the views are kept out of the imports of apps.ready()
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from .throttling import exempt_request
+    from .views import AdminModelViewSet
+
+    users = get_warmup_users() if users is None else users
+    models = list(admin.site._registry) if models is None else models
+    languages = languages or [settings.LANGUAGE_CODE]
+    factory = APIRequestFactory(HTTP_HOST=host or get_default_host())
+
+    results = []
+
+    def run(label, action, path, **kwargs):
+        # Warm-up requests do not use up the user's throttle budget and request slots
+        request = exempt_request(factory.get(f'/{path}', secure=secure))
+        force_authenticate(request, user)
+        started = time.perf_counter()
+        try:
+            view = AdminModelViewSet.as_view({'get': action})
+            status_code = view(request, **kwargs).status_code
+        except Exception:
+            logger.warning('Warm-up of %s %s failed', label, action, exc_info=True)
+            status_code = None
+        results.append((label, action, status_code, time.perf_counter() - started))
+
+    for user in users:
+        for language in languages:
+            with translation.override(language):
+                run('admin', 'list', '')
+
+                for model in models:
+                    opts = model._meta
+                    for action in MODEL_ACTIONS:
+                        run(
+                            opts.label, action,
+                            f'{opts.app_label}/{opts.model_name}/{MODEL_ACTION_PATHS[action]}',
+                            app_name=opts.app_label, model_name=opts.model_name,
+                        )
+
+    return results
+
+def warm_up_process(user=None, models=None, host=None, secure=False):
+    """
+    Build the caches of the current process for every registered model:
+    field types, validator descriptions, inline schemas and ChangeList classes.
+    No ChangeList is instantiated, so no list filter or changelist query runs.
+
+    The schemas are computed directly, bypassing the shared cache, so each
+    process builds its own caches even when another one filled the shared
+    entries already. Returns the labels of the models warmed up.
+    """
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from .changelist import get_deferred_changelist_class
+    from .views import AdminModelViewSet
+
+    if user is None:
+        users = get_warmup_users()
+        if not users:
+            return []
+        user = users[0]
+
+    models = list(admin.site._registry) if models is None else models
+    factory = APIRequestFactory(HTTP_HOST=host or get_default_host())
+
+    warmed = []
+    for model in models:
+        opts = model._meta
+        register_app = admin.site._registry[model]
+
+        request = factory.get(f'/{opts.app_label}/{opts.model_name}/fields/', secure=secure)
+        force_authenticate(request, user)
+        view = AdminModelViewSet(
+            action_map={'get': 'list_field_meta'}, format_kwarg=None,
+            kwargs={'app_name': opts.app_label, 'model_name': opts.model_name},
+        )
+        view.request = request = view.initialize_request(request)
+
+        try:
+            view.get_model_fields_data(request, model, register_app)
+            # The class only: building a ChangeList evaluates list_filter
+            # choices, and overridden get_changelist_instance load results
+            get_deferred_changelist_class(register_app.get_changelist(request))
+        except Exception:
+            logger.warning('Warm-up of %s failed', opts.label, exc_info=True)
+            continue
+        warmed.append(opts.label)
+
+    return warmed
+
+def get_request_origin(environ=None, scope=None):
+    """
+    Return the (host, secure) pair of a starting WSGI or ASGI request.
+    """
+    if scope is not None:
+        headers = dict(scope.get('headers', ()))
+        host = headers.get(b'host', b'').decode('latin-1')
+        secure = scope.get('scheme') in ('https', 'wss')
+    else:
+        environ = environ or {}
+        host = environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')
+        secure = environ.get('wsgi.url_scheme') == 'https'
+    return host, secure
+
+_started = False
+_started_lock = threading.Lock()
+
+def warm_up_worker(sender, environ=None, scope=None, **kwargs):
+    """
+    request_started receiver warming up the serving process in a background thread.
+
+    Connected by the app config when ADMIN_MIS_WARMUP is set. It runs once per
+    process, on its first request, so the caches of forked workers are filled
+    and management commands never trigger it. The host and scheme of that
+    request are used, as they are part of the inline schema keys.
+    """
+    global _started
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+    request_started.disconnect(warm_up_worker, dispatch_uid='admin_mis_warmup')
+
+    host, secure = get_request_origin(environ, scope)
+
+    def target():
+        try:
+            with translation.override(settings.LANGUAGE_CODE):
+                warmed = warm_up_process(host=host or None, secure=secure)
+            logger.info('Warmed up %s admin models', len(warmed))
+        except Exception:
+            logger.warning('Warm-up failed', exc_info=True)
+        finally:
+            # The connections opened by this thread
+            connections.close_all()
+
+    threading.Thread(target=target, name='admin-mis-warmup', daemon=True).start()
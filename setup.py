@@ -1,5 +1,5 @@
 import os
-from setuptools import setup
+from setuptools import find_packages, setup
 
 README = open(os.path.join(os.path.dirname(__file__), 'readme.md')).read()
 
@@ -9,7 +9,7 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 setup(
     name='django-admin-mis', 
     version='0.0.1',
-    packages=['django_admin_mis'],
+    packages=find_packages(include=['django_admin_mis', 'django_admin_mis.*']),
     include_package_data=True,
     license='MIT License',
     description='django-admin-mis is a Django application designed to simplify the management of Single Sign-On (SSO) clients within a web application. It provides functionalities for handling login and logout processes and conveniently sets codes in cookies for seamless authentication and user session management. By integrating this app into a Django project, developers can streamline the implementation of SSO functionality and enhance the overall user experience.',
@@ -34,6 +34,7 @@ setup(
         'requests>=2.28.1',
     ],
     extras_require={
-        "dev": ['twine>=4.0.2',]
+        "dev": ['twine>=4.0.2',],
+        "fast": ['orjson>=3.8', 'msgpack>=1.0'],
     }
 )